@@ -0,0 +1,143 @@
+import re
+import time
+
+# Listing-type prefixes removed from the property name. The original list was applied one
+# pattern at a time in this order; chaining them as optional groups in one regex keeps the
+# same result in a single pass.
+PROPERTY_PREFIXES = [
+    r'Apartment\s+\d+\s*,?\s*',          # "Apartment 21, " or "Apartment 5, "
+    r'Flat\s+\d+\s*,?\s*',               # "Flat 5, "
+    r'Studio\s+\d+\s*,?\s*',             # "Studio 3, "
+    r'Unit\s+\d+\s*,?\s*',               # "Unit 12, "
+    r'\d+\s+Bedroom\s+Apartment\s*,?\s*', # "1 Bedroom Apartment, "
+    r'\d+\s+Bedroom\s+Flat\s*,?\s*',      # "2 Bedroom Flat, "
+    r'\d+\s+Bedroom\s*,?\s*',             # "1 Bedroom, "
+    r'Apartment\s*,?\s*',                 # "Apartment, "
+    r'Flat\s*,?\s*',                      # "Flat, "
+    r'Studio\s*,?\s*',                    # "Studio, "
+    r'House\s*,?\s*',                     # "House, "
+]
+
+# Bedroom info and apartment/house prefixes removed from the start of the location
+LOCATION_PREFIXES = [
+    r'Apartment\s+\d+\s+Bedroom\s*,?\s*',
+    r'House\s+\d+\s+Bedroom\s*,?\s*',
+    r'Studio\s+Apartment\s*,?\s*',
+    r'\d+\s+Bedroom\s+Apartment\s*,?\s*',
+    r'\d+\s+Bedroom\s+House\s*,?\s*',
+    r'\d+\s+Bedroom\s*,?\s*',
+    r'\d+\s+Bed\s*,?\s*',
+    r'Studio\s*,?\s*',
+    r'Apartment\s*,?\s*',
+    r'House\s*,?\s*',
+]
+
+PROPERTY_PREFIX_RE = re.compile("^" + "".join(f"(?:{p})?" for p in PROPERTY_PREFIXES), re.IGNORECASE)
+# The first location prefix only matches with no leading whitespace; the rest run on stripped text
+LOCATION_PREFIX_RE = re.compile(
+    "^" + f"(?:{LOCATION_PREFIXES[0]})?" + r"\s*" + "".join(f"(?:{p})?" for p in LOCATION_PREFIXES[1:]),
+    re.IGNORECASE,
+)
+STREET_ADDRESS_RE = re.compile(r'^\d+\s+[A-Za-z]')     # "39 Synge Street"
+LEADING_SYMBOLS_RE = re.compile(r'^[^\w\s]+')
+LEADING_NUMBER_RE = re.compile(r'^\d+\s*(?![A-Za-z])')
+LOCATION_LEADING_JUNK_RE = re.compile(r'^[^\w\s]+\s*(?:,\s*)?')
+COMMA_RE = re.compile(r'\s*,\s*')
+DUBLIN_ZONE_RE = re.compile(r"Dublin\s+(\d{1,2})", re.IGNORECASE)
+
+
+def extract_dublin_zone(address_text: str) -> str:
+    """Extracts Dublin zone (D1, D2, etc.) from address text."""
+    # Look for patterns like "Dublin 1", "Dublin 12", etc.
+    match = DUBLIN_ZONE_RE.search(address_text)
+    if match:
+        return f"D{match.group(1)}"
+    return None
+
+
+def strip_property_prefixes(text: str) -> str:
+    return PROPERTY_PREFIX_RE.sub('', text.strip(), count=1).strip()
+
+
+def normalise_property_name(full_address: str) -> str:
+    """Short property name from a daft.ie address, e.g. "Apartment 17, Spencer House, ..." -> "Spencer House"."""
+    address_parts = [part.strip() for part in full_address.split(',')]
+    property_name = strip_property_prefixes(address_parts[0])
+
+    # Keep street addresses like "39 Synge Street"; otherwise drop leading symbols and bare numbers
+    if not STREET_ADDRESS_RE.match(property_name):
+        property_name = LEADING_SYMBOLS_RE.sub('', property_name).strip()
+        if not STREET_ADDRESS_RE.match(property_name):
+            property_name = LEADING_NUMBER_RE.sub('', property_name).strip()
+    property_name = ' '.join(property_name.split())
+
+    # Nothing meaningful left - fall back to the second part of the address
+    if len(property_name) < 2:
+        if len(address_parts) > 1:
+            property_name = strip_property_prefixes(address_parts[1])
+        else:
+            property_name = "Unknown Property"
+    return property_name or "Unknown Property"
+
+
+def normalise_location(full_address: str) -> str:
+    """Official-looking address with listing-type prefixes and stray punctuation removed."""
+    clean_address = LOCATION_PREFIX_RE.sub('', full_address, count=1).strip()
+    clean_address = LOCATION_LEADING_JUNK_RE.sub('', clean_address, count=1).strip()
+    clean_address = ' '.join(COMMA_RE.sub(', ', clean_address).split())
+    return clean_address or full_address
+
+
+def normalise_address(full_address: str) -> dict:
+    """Property name, location and Dublin zone for one raw daft.ie address."""
+    normalised = {
+        "property_name": normalise_property_name(full_address),
+        "location": normalise_location(full_address),
+    }
+    dublin_zone = extract_dublin_zone(full_address)
+    if dublin_zone:
+        normalised["dublin_zone"] = dublin_zone
+    return normalised
+
+
+def normalise_many(addresses) -> list:
+    """Normalises a batch of addresses, computing each distinct address only once."""
+    seen = {}
+    results = []
+    for address in addresses:
+        normalised = seen.get(address)
+        if normalised is None:
+            normalised = seen[address] = normalise_address(address)
+        results.append(dict(normalised))
+    return results
+
+
+# Real daft.ie address strings used by the micro-benchmark below
+SAMPLE_ADDRESSES = [
+    "Apartment 17, Spencer House, Custom House Square, Mayor Street Lower, IFSC, Dublin 1",
+    "Apartment 1 Bedroom, O'Neill Court, Main Street, Belmayne, Dublin 13",
+    "39 Synge Street, Portobello, Dublin 8",
+    "Griffith Wood, Griffith Avenue, Drumcondra, Dublin 9",
+    "Studio Apartment, 12 Castle Gate, Lord Edward Street, Dublin 2",
+    "2 Bedroom Apartment, The Hendrick, Smithfield, Dublin 7",
+    "Flat 5, 22 Leeson Street Upper, Dublin 4",
+    "House, 14 Tolka Road, Drumcondra, Dublin 3",
+]
+
+
+if __name__ == "__main__":
+    # Micro-benchmark: python address_normaliser.py
+    batch = SAMPLE_ADDRESSES * 2500
+    for address in SAMPLE_ADDRESSES:
+        print(f"{address!r}\n    -> {normalise_address(address)}")
+
+    started = time.perf_counter()
+    for address in batch:
+        normalise_address(address)
+    elapsed = time.perf_counter() - started
+    print(f"\nnormalise_address: {len(batch)} addresses in {elapsed * 1000:.1f} ms ({elapsed / len(batch) * 1e6:.2f} µs each)")
+
+    started = time.perf_counter()
+    normalise_many(batch)
+    elapsed = time.perf_counter() - started
+    print(f"normalise_many:    {len(batch)} addresses in {elapsed * 1000:.1f} ms ({elapsed / len(batch) * 1e6:.2f} µs each)")
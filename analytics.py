@@ -0,0 +1,165 @@
+"""Columnar snapshot of the tracker and the aggregate reports run over it.
+
+    python analytics.py                                  # reports from the local mirror
+    python analytics.py --out tracker.parquet            # ...and write the snapshot
+
+pandas and pyarrow are imported lazily; both come with Streamlit.
+"""
+import argparse
+import os
+import sys
+import time
+
+from notion_mirror import NotionMirror
+from price_parser import MONTHLY_PRICE_FIELD, parse_price_eur
+
+# Snapshot column -> mirrored record property
+SNAPSHOT_FIELDS = {
+    "property_name": "Property Name",
+    "status": "Status",
+    "housing_type": "Housing Type Needed",
+    "dublin_zone": "Dublin Zone",
+    "location": "Location",
+    "price": "Price",
+    "website_link": "Website Link",
+    "application_date": "Application Date",
+}
+CATEGORY_COLUMNS = ("status", "housing_type", "dublin_zone")
+# Statuses that mean the landlord/agent has got back to us
+RESPONSE_STATUSES = ("Rejected", "Accepted", "Interview/Tour", "Waitlisted")
+NOT_APPLIED = "Not yet applied"
+
+
+def build_snapshot(items):
+    """DataFrame of (page_id, last_edited_time, record) rows with typed, parsed columns."""
+    import pandas as pd
+
+    columns = {name: [] for name in ("page_id", "last_edited", *SNAPSHOT_FIELDS, "monthly_price")}
+    for page_id, last_edited, record in items:
+        columns["page_id"].append(page_id)
+        columns["last_edited"].append(last_edited or None)
+        for column, prop in SNAPSHOT_FIELDS.items():
+            columns[column].append(record.get(prop))
+        # Notion dates may carry a time and offset; the day is what the reports use
+        columns["application_date"][-1] = (record.get("Application Date") or "")[:10] or None
+        monthly_price = record.get(MONTHLY_PRICE_FIELD)
+        columns["monthly_price"].append(monthly_price if monthly_price is not None else parse_price_eur(record.get("Price")))
+
+    frame = pd.DataFrame(columns)
+    frame["application_date"] = pd.to_datetime(frame["application_date"], errors="coerce", format="%Y-%m-%d")
+    frame["last_edited"] = pd.to_datetime(frame["last_edited"], errors="coerce", utc=True).dt.tz_localize(None)
+    frame["monthly_price"] = pd.to_numeric(frame["monthly_price"], errors="coerce").astype("float64")
+    for column in CATEGORY_COLUMNS:
+        frame[column] = frame[column].astype("category")
+    return frame
+
+
+def write_snapshot(frame, target) -> None:
+    """Writes the snapshot as Parquet (via pyarrow) to a path or binary file object."""
+    if isinstance(target, str) and os.path.dirname(target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+    frame.to_parquet(target, index=False, engine="pyarrow")
+
+
+def read_snapshot(path: str):
+    import pandas as pd
+    return pd.read_parquet(path, engine="pyarrow")
+
+
+# --- reports ---
+
+def success_rate_by_zone(frame):
+    """Applications, outcomes and acceptance rate per Dublin Zone."""
+    applied = frame[frame["status"] != NOT_APPLIED]
+    report = applied.assign(
+        accepted=applied["status"] == "Accepted",
+        rejected=applied["status"] == "Rejected",
+        waiting=applied["status"].isin(["Applied", "Waitlisted", "Interview/Tour"]),
+    ).groupby("dublin_zone", observed=True).agg(
+        applications=("page_id", "size"),
+        accepted=("accepted", "sum"),
+        rejected=("rejected", "sum"),
+        waiting=("waiting", "sum"),
+    )
+    report["success_rate"] = (report["accepted"] / report["applications"]).round(3)
+    return report.sort_values(["success_rate", "applications"], ascending=False).reset_index()
+
+
+def price_by_housing_type(frame):
+    """Median and quartile monthly rent per housing type."""
+    priced = frame.dropna(subset=["monthly_price"])
+    report = priced.groupby("housing_type", observed=True)["monthly_price"].agg(
+        listings="size",
+        median="median",
+        p25=lambda prices: prices.quantile(0.25),
+        p75=lambda prices: prices.quantile(0.75),
+    )
+    return report.round(0).reset_index()
+
+
+def time_to_response_by_status(frame):
+    """Days from application to the entry's last edit, for entries that got a response.
+
+    The last edit is when the status was most recently changed in most cases, so this
+    approximates how long each kind of response took to arrive.
+    """
+    responded = frame[frame["status"].isin(RESPONSE_STATUSES)].dropna(subset=["application_date", "last_edited"])
+    days = (responded["last_edited"] - responded["application_date"]).dt.days.clip(lower=0)
+    report = days.groupby(responded["status"], observed=True).agg(["size", "median", "mean", "max"])
+    report.columns = ["entries", "median_days", "mean_days", "max_days"]
+    return report.round(1).reset_index()
+
+
+def applications_per_week(frame):
+    """Applications sent per week (by application date)."""
+    applied = frame[frame["status"] != NOT_APPLIED].dropna(subset=["application_date"])
+    weeks = applied["application_date"].dt.to_period("W-SUN").dt.start_time
+    report = weeks.value_counts().sort_index().rename("applications").to_frame()
+    report.index.name = "week_starting"
+    return report.reset_index()
+
+
+REPORTS = {
+    "Success rate by Dublin Zone": success_rate_by_zone,
+    "Rent by housing type (EUR/month)": price_by_housing_type,
+    "Time to response by status": time_to_response_by_status,
+    "Applications per week": applications_per_week,
+}
+
+
+def run_reports(frame) -> dict:
+    """Runs every report; returns {title: (DataFrame, seconds)}."""
+    results = {}
+    for title, report in REPORTS.items():
+        started = time.perf_counter()
+        results[title] = (report(frame), time.perf_counter() - started)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Snapshot the tracker's local mirror and print aggregate reports.")
+    data_dir = os.getenv("TRACKER_DATA_DIR", ".tracker_data")
+    parser.add_argument("--mirror", default=os.path.join(data_dir, "notion_mirror.sqlite3"), help="local mirror database")
+    parser.add_argument("--snapshot", help="read this Parquet snapshot instead of the mirror")
+    parser.add_argument("--out", help="write the snapshot to this Parquet file")
+    args = parser.parse_args(argv)
+
+    if args.snapshot:
+        frame = read_snapshot(args.snapshot)
+    else:
+        if not os.path.exists(args.mirror):
+            parser.error(f"No mirror at {args.mirror}; run the app once to sync it, or pass --snapshot")
+        # Read-only use: no client is needed unless we sync
+        frame = build_snapshot(NotionMirror(args.mirror, client=None, database_id=None).snapshot_items())
+    if args.out:
+        write_snapshot(frame, args.out)
+        print(f"Wrote {len(frame)} rows to {args.out}")
+
+    for title, (report, seconds) in run_reports(frame).items():
+        print(f"\n== {title} ({seconds * 1000:.1f} ms)")
+        print(report.to_string(index=False) if len(report) else "(no data)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,311 +1,312 @@
-from langchain_openai import ChatOpenAI
+import time
+_script_started = time.perf_counter()
+
 from dotenv import load_dotenv
-from notion_client import Client
 from datetime import datetime, timedelta
 import streamlit as st
-import dateparser
+import functools
+import io
 import os
 import json
 import re
-import time
-
-# Selenium Imports for Web Scraping
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Heavy dependencies (Selenium, LangChain/OpenAI, notion_client, dateparser) are
+# imported lazily by the workflow that needs them - see the service registry below.
+from daft_parser import build_listing_record, extract_listing_fields, extract_rendered_fields, fetch_listing_html, listing_id_from_url
+from scrape_cache import ScrapeCache
+from notion_mirror import NotionMirror, flatten_properties, iter_query_rows, iter_record_rows
+from notion_filter import LocalQueryEngine, UnsupportedFilterError, remote_payload
+from llm_cache import LLMResponseCache
+from job_queue import JobQueue
+from price_parser import parse_price_eur
+from intent_rules import STATUS_OPTIONS, classify_intent_fast, extract_date_from_text, parse_natural_date
+from dedup import DedupIndex
+from name_index import AmbiguousPropertyError, NameIndex
+from tracing import Tracer
+from search_watcher import SearchWatcher
+from analytics import build_snapshot, run_reports, write_snapshot
 
 load_dotenv()
 
 DATABASE_ID = "244aef75cd248040aee9fbbe4a05e42f"
 
-try:
-    notion = Client(auth=st.secrets["NOTION_API_KEY"])
-    llm = ChatOpenAI(
-    model="gpt-4o-mini",  # or "gpt-4o-mini", etc.
-    temperature=0,
-    openai_api_key=st.secrets["OPENAI_API_KEY"]
-)
-except Exception as e:
-    st.error(f"Failed to initialize clients. Please check your API keys in Streamlit secrets. Error: {e}")
-    st.stop()
-
-# ✅ Set environment variables for LangChain using Streamlit secrets
-os.environ["LANGCHAIN_PROJECT"] = "NotionHouseTrackerProject"
-os.environ["LANGCHAIN_TRACING_V2"] = "true"
-os.environ["LANGCHAIN_API_KEY"] = st.secrets["LANGCHAIN_API_KEY"]
-
 today = datetime.now().date()
 yesterday = today - timedelta(days=1)
 last_week = today - timedelta(days=7)
 
-# Database property options
+# Database property options (STATUS_OPTIONS lives in intent_rules, which builds its status phrases from it)
 HOUSING_TYPES = ["Studio", "1 Bedroom", "2 Bedroom", "3 Bedroom+", "House"]
-STATUS_OPTIONS = ["Not yet applied", "Applied", "Rejected", "Accepted", "Interview/Tour", "Waitlisted"]
 
+# Headless browser pool settings (override via environment / .env)
+SCRAPER_POOL_SIZE = int(os.getenv("SCRAPER_POOL_SIZE", "2"))
+SCRAPER_POOL_WARM = int(os.getenv("SCRAPER_POOL_WARM", "1"))
+SCRAPER_MAX_PAGES_PER_DRIVER = int(os.getenv("SCRAPER_MAX_PAGES_PER_DRIVER", "25"))
+BULK_MAX_WORKERS = int(os.getenv("BULK_MAX_WORKERS", str(SCRAPER_POOL_SIZE)))
+
+# Local on-disk state (caches, mirrors) lives here
+DATA_DIR = os.getenv("TRACKER_DATA_DIR", ".tracker_data")
+SCRAPE_CACHE_TTL_HOURS = float(os.getenv("SCRAPE_CACHE_TTL_HOURS", "168"))
+SCRAPE_CACHE_MAX_ENTRIES = int(os.getenv("SCRAPE_CACHE_MAX_ENTRIES", "1000"))
+MIRROR_SYNC_SECONDS = float(os.getenv("MIRROR_SYNC_SECONDS", "60"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512"))
+LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "24"))
+LLM_CACHE_PERSIST = os.getenv("LLM_CACHE_PERSIST", "true").lower() in ("1", "true", "yes")
+NOTION_RATE_PER_SECOND = float(os.getenv("NOTION_RATE_PER_SECOND", "3"))
+NOTION_MAX_CONCURRENCY = int(os.getenv("NOTION_MAX_CONCURRENCY", "3"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", str(SCRAPER_POOL_SIZE)))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "5000"))
+TRACE_SLOW_SECONDS = float(os.getenv("TRACE_SLOW_SECONDS", "2"))
+WATCH_INTERVAL_MINUTES = float(os.getenv("WATCH_INTERVAL_MINUTES", "30"))  # 0 disables scheduled polling
+WATCH_MAX_PAGES = int(os.getenv("WATCH_MAX_PAGES", "3"))
+QUERY_BATCH_SIZE = int(os.getenv("QUERY_BATCH_SIZE", "100"))  # Rows added to the results table per update
+# Optional Notion Number property that receives the parsed monthly EUR price (leave unset if the database has none)
+NOTION_PRICE_NUMBER_PROPERTY = os.getenv("NOTION_PRICE_NUMBER_PROPERTY", "")
+
+DAFT_URL_PATTERN = re.compile(r"https?://(www\.)?daft\.ie/[^\s]+")
+
+# A listing scraped over plain HTTP must have these, otherwise we render it in the browser
+REQUIRED_LISTING_FIELDS = ("price", "address")
+
+
+# --- 🧰 SERVICE REGISTRY 🧰 ---
+# Clients are built on first use and cached once per process with st.cache_resource,
+# so Streamlit reruns don't pay for them and each workflow only loads what it needs.
+
+@st.cache_resource
+def get_service_timings() -> dict:
+    """Seconds each service took to load the first time, per process."""
+    return {}
+
+def timed_service(name: str):
+    """Records how long a service factory takes in get_service_timings()."""
+    def decorate(factory):
+        @functools.wraps(factory)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            service = factory(*args, **kwargs)
+            get_service_timings()[name] = time.perf_counter() - started
+            return service
+        return wrapper
+    return decorate
+
+@st.cache_resource
+def get_tracer() -> Tracer:
+    """Process-wide span recorder behind the stage timings panel."""
+    return Tracer(capacity=TRACE_BUFFER_SIZE, slow_seconds=TRACE_SLOW_SECONDS)
+
+def traced(name: str):
+    """Times every call of the decorated function as a span named `name`."""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with get_tracer().span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+@st.cache_resource
+@timed_service("Notion client")
+def get_notion():
+    """Synchronous Notion client."""
+    from notion_client import Client
+    return Client(auth=st.secrets["NOTION_API_KEY"])
+
+@st.cache_resource
+@timed_service("OpenAI LLM")
+def get_llm():
+    """The chat model, with LangChain tracing configured from Streamlit secrets."""
+    from langchain_openai import ChatOpenAI
+
+    # ✅ Set environment variables for LangChain using Streamlit secrets
+    os.environ["LANGCHAIN_PROJECT"] = "NotionHouseTrackerProject"
+    os.environ["LANGCHAIN_TRACING_V2"] = "true"
+    os.environ["LANGCHAIN_API_KEY"] = st.secrets["LANGCHAIN_API_KEY"]
+
+    return ChatOpenAI(
+        model="gpt-4o-mini",  # or "gpt-4o-mini", etc.
+        temperature=0,
+        openai_api_key=st.secrets["OPENAI_API_KEY"]
+    )
 
 # --- 🤖 CORE FUNCTIONS 🤖 ---
 
-def extract_dublin_zone(address_text: str) -> str:
-    """Extracts Dublin zone (D1, D2, etc.) from address text."""
-    # Look for patterns like "Dublin 1", "Dublin 12", etc.
-    dublin_pattern = r"Dublin\s+(\d{1,2})"
-    match = re.search(dublin_pattern, address_text, re.IGNORECASE)
-    if match:
-        zone_number = match.group(1)
-        return f"D{zone_number}"
-    return None
-
-def scrape_daft_ie(url: str) -> dict:
-    """Scrapes a daft.ie URL using a headless browser on Streamlit Cloud."""
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-
-    # Use the pre-installed chromium driver on Streamlit Cloud
-    service = Service(executable_path="/usr/bin/chromedriver")
-    
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    
-    scraped_data = {}
-    
-    try:
-        driver.get(url)
-        wait = WebDriverWait(driver, 15) # Increased wait time for cloud environment
-        wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, '[data-testid="price"]')))
-        
-        # --- Extract data using Selenium's finders ---
-        
-        # Extract Price
-        try:
-            price_element = driver.find_element(By.CSS_SELECTOR, '[data-testid="price"]')
-            price_text = price_element.text.replace(" per month", "").strip()
-            scraped_data['price'] = price_text
-        except Exception: 
-            scraped_data['price'] = "Price not found"
-
-        # Extract Address and Property Name
+@st.cache_resource
+@timed_service("Browser pool")
+def get_driver_pool():
+    """One pool of warm headless browsers per process, shared by every session."""
+    from driver_pool import DriverPool
+    pool = DriverPool(size=SCRAPER_POOL_SIZE, max_pages=SCRAPER_MAX_PAGES_PER_DRIVER)
+    pool.warm(SCRAPER_POOL_WARM)
+    return pool
+
+def scrape_listing_with_browser(url: str, pool=None) -> dict:
+    """Reads raw listing fields by rendering the page in a pooled headless browser."""
+    # Selenium Imports for Web Scraping
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    pool = pool or get_driver_pool()
+    tracer = get_tracer()
+
+    with pool.session() as driver:
+        with tracer.span("browser.get"):
+            driver.get(url)
+        with tracer.span("browser.wait"):
+            wait = WebDriverWait(driver, 15) # Increased wait time for cloud environment
+            wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, '[data-testid="price"]')))
+
+        # Every field and contact selector in one round trip (see LISTING_FIELD_SELECTORS)
         try:
-            address_element = driver.find_element(By.CSS_SELECTOR, '[data-testid="address"]')
-            full_address = address_element.text
-            
-            # Split address parts
-            address_parts = [part.strip() for part in full_address.split(',')]
-            
-            # Property name extraction logic
-            raw_property_name = address_parts[0] if address_parts else "Unknown Property"
-            
-            # Clean up the raw property name
-            property_name = raw_property_name.strip()
-            
-            # Remove common prefixes and apartment/flat numbers
-            apartment_patterns = [
-                r'^Apartment\s+\d+\s*,?\s*',          # "Apartment 21, " or "Apartment 5, "
-                r'^Flat\s+\d+\s*,?\s*',               # "Flat 5, "
-                r'^Studio\s+\d+\s*,?\s*',             # "Studio 3, "
-                r'^Unit\s+\d+\s*,?\s*',               # "Unit 12, "
-                r'^\d+\s+Bedroom\s+Apartment\s*,?\s*', # "1 Bedroom Apartment, "
-                r'^\d+\s+Bedroom\s+Flat\s*,?\s*',      # "2 Bedroom Flat, "
-                r'^\d+\s+Bedroom\s*,?\s*',             # "1 Bedroom, "
-                r'^Apartment\s*,?\s*',                 # "Apartment, "
-                r'^Flat\s*,?\s*',                      # "Flat, "
-                r'^Studio\s*,?\s*',                    # "Studio, "
-                r'^House\s*,?\s*'                      # "House, "
-            ]
-            
-            for pattern in apartment_patterns:
-                property_name = re.sub(pattern, '', property_name, flags=re.IGNORECASE).strip()
-            
-            # Handle cases like "39 Synge Street" where we want the street name/number combo
-            # or "Castle Gate" where we want the building name
-            
-            # If what remains is just a number followed by a street name, keep it as is
-            # Example: "39 Synge Street" -> "39 Synge Street"
-            if re.match(r'^\d+\s+[A-Za-z]', property_name):
-                # This looks like a street address, keep it
-                pass
-            else:
-                # For named buildings, take the first meaningful part
-                # Split by comma and take the first non-empty part
-                name_parts = [part.strip() for part in property_name.split(',') if part.strip()]
-                if name_parts:
-                    property_name = name_parts[0]
-            
-            # Remove any remaining leading symbols or numbers that aren't part of a street address
-            if not re.match(r'^\d+\s+[A-Za-z]', property_name):  # Don't clean if it's like "39 Street Name"
-                property_name = re.sub(r'^[^\w\s]+', '', property_name).strip()  # Remove leading symbols
-                # Only remove leading standalone numbers if they're not part of a street address
-                if not re.match(r'^\d+\s+[A-Za-z]', property_name):
-                    property_name = re.sub(r'^\d+\s*(?![A-Za-z])', '', property_name).strip()
-            
-            # Clean up any remaining extra spaces and commas
-            property_name = re.sub(r'\s*,\s*', ' ', property_name)  # Replace commas with spaces
-            property_name = ' '.join(property_name.split())  # Normalize spaces
-            
-            # Final fallback - if we still have nothing meaningful, try to get from address parts
-            if not property_name or len(property_name) < 2:
-                if len(address_parts) > 1:
-                    # Try the second part of the address
-                    property_name = address_parts[1].strip()
-                    # Clean it similarly
-                    for pattern in apartment_patterns:
-                        property_name = re.sub(pattern, '', property_name, flags=re.IGNORECASE).strip()
-                else:
-                    property_name = "Unknown Property"
-            
-            scraped_data['property_name'] = property_name if property_name else "Unknown Property"
-            
-            # For location, create a clean official address format
-            clean_address = full_address
-            
-            # Remove bedroom info and apartment/house prefixes from the beginning
-            address_clean_patterns = [
-                r'^Apartment\s+\d+\s+Bedroom\s*,?\s*',
-                r'^House\s+\d+\s+Bedroom\s*,?\s*',  
-                r'^Studio\s+Apartment\s*,?\s*',
-                r'^\d+\s+Bedroom\s+Apartment\s*,?\s*',
-                r'^\d+\s+Bedroom\s+House\s*,?\s*',
-                r'^\d+\s+Bedroom\s*,?\s*',
-                r'^\d+\s+Bed\s*,?\s*',
-                r'^Studio\s*,?\s*',
-                r'^Apartment\s*,?\s*',
-                r'^House\s*,?\s*'
-            ]
-            
-            for pattern in address_clean_patterns:
-                clean_address = re.sub(pattern, '', clean_address, flags=re.IGNORECASE).strip()
-            
-            # Remove any leading symbols or special characters from address
-            clean_address = re.sub(r'^[^\w\s]+', '', clean_address).strip()
-            
-            # Clean up any remaining extra commas or spaces at the beginning
-            clean_address = re.sub(r'^,\s*', '', clean_address).strip()
-            clean_address = re.sub(r'\s*,\s*', ', ', clean_address)  # Normalize comma spacing
-            clean_address = ' '.join(clean_address.split())  # Normalize spaces
-            
-            scraped_data['location'] = clean_address if clean_address else full_address
-            
-            # Extract Dublin Zone from the full address
-            dublin_zone = extract_dublin_zone(full_address)
-            if dublin_zone:
-                scraped_data['dublin_zone'] = dublin_zone
-                
-        except Exception: 
-            scraped_data['property_name'] = "Unknown Property"
-            scraped_data['location'] = "Location not found"
-            
-        # Extract Housing Type from URL or page content
-        try:
-            # First try to get from URL
-            housing_type = None
-            url_lower = url.lower()
-            
-            if 'studio' in url_lower:
-                housing_type = 'Studio'
-            elif '1-bedroom' in url_lower or '1bedroom' in url_lower:
-                housing_type = '1 Bedroom'
-            elif '2-bedroom' in url_lower or '2bedroom' in url_lower:
-                housing_type = '2 Bedroom'
-            elif '3-bedroom' in url_lower or '3bedroom' in url_lower or 'bedroom' in url_lower and '3' in url_lower:
-                housing_type = '3 Bedroom+'
-            
-            # If not found in URL, try to get from beds element
-            if not housing_type:
-                try:
-                    beds_element = driver.find_element(By.CSS_SELECTOR, '[data-testid="beds"]')
-                    beds_text = beds_element.text.lower()
-                    if 'studio' in beds_text:
-                        housing_type = 'Studio'
-                    elif '1' in beds_text and 'bed' in beds_text:
-                        housing_type = '1 Bedroom'
-                    elif '2' in beds_text and 'bed' in beds_text:
-                        housing_type = '2 Bedroom'
-                    elif '3' in beds_text and 'bed' in beds_text:
-                        housing_type = '3 Bedroom+'
-                except Exception:
-                    pass
-            
-            if housing_type:
-                scraped_data['housing_type'] = housing_type
-                
-        except Exception: pass
-
-        # Extract Contact Information
-        try:
-            # Try multiple selectors for contact info
-            contact_selectors = [
-                '[data-testid="agent-name"]',
-                '.agent-name',
-                '[data-testid="contact-name"]',
-                '.contact-name',
-                '.agent-details h3',
-                '.agent-details h4',
-                '.contact-details h3',
-                '.contact-details h4'
-            ]
-            
-            contact_info = None
-            for selector in contact_selectors:
-                try:
-                    contact_element = driver.find_element(By.CSS_SELECTOR, selector)
-                    if contact_element.text.strip():
-                        contact_info = contact_element.text.strip()
-                        break
-                except Exception:
-                    continue
-            
-            # If still not found, try to find any element containing agent/contact info
-            if not contact_info:
-                try:
-                    # Look for agent or contact information in various ways
-                    potential_contacts = driver.find_elements(By.XPATH, "//*[contains(text(), 'Contact') or contains(text(), 'Agent')]/following-sibling::*")
-                    for element in potential_contacts:
-                        text = element.text.strip()
-                        if text and len(text) > 2 and len(text) < 50:  # Reasonable name length
-                            contact_info = text
-                            break
-                except Exception:
-                    pass
-            
-            if contact_info:
-                scraped_data['contact_info'] = contact_info
-            else:
-                scraped_data['contact_info'] = "Contact info not found"
-                
+            with tracer.span("browser.extract"):
+                raw = extract_rendered_fields(driver)
         except Exception:
-            scraped_data['contact_info'] = "Contact info not found"
-
-    finally:
-        driver.quit()
-
+            # Script blocked or failed - parse one snapshot of the rendered markup instead
+            with tracer.span("browser.page_source"):
+                raw = extract_listing_fields(driver.page_source)
+
+    return raw
+
+@st.cache_resource
+@timed_service("Scrape cache")
+def get_scrape_cache() -> ScrapeCache:
+    """Process-wide cache of scraped listings, keyed by daft.ie listing ID."""
+    return ScrapeCache(
+        os.path.join(DATA_DIR, "scrape_cache.sqlite3"),
+        ttl_seconds=SCRAPE_CACHE_TTL_HOURS * 3600,
+        max_entries=SCRAPE_CACHE_MAX_ENTRIES,
+    )
+
+@traced("scrape")
+def scrape_daft_ie(url: str, pool=None, force_refresh: bool = False, cache: ScrapeCache = None) -> dict:
+    """Scrapes a daft.ie URL, falling back to a pooled headless browser only when needed."""
+    tracer = get_tracer()
+    cache = cache or get_scrape_cache()
+    listing_id = listing_id_from_url(url)
+    if listing_id and not force_refresh:
+        with tracer.span("scrape.cache"):
+            cached = cache.get(listing_id)
+        if cached:
+            return cached
+
+    # Fast path: the listing is server-rendered, so plain HTTP is usually enough
+    try:
+        with tracer.span("scrape.http"):
+            html = fetch_listing_html(url)
+        with tracer.span("scrape.parse"):
+            raw = extract_listing_fields(html)
+    except Exception:
+        raw = {}
+
+    if not all(raw.get(field) for field in REQUIRED_LISTING_FIELDS):
+        with tracer.span("scrape.browser"):
+            browser_raw = scrape_listing_with_browser(url, pool)
+        raw.update({field: value for field, value in browser_raw.items() if value})
+
+    scraped_data = build_listing_record(url, raw)
+    # Only remember complete scrapes so a flaky page gets retried next time
+    if listing_id and all(raw.get(field) for field in REQUIRED_LISTING_FIELDS):
+        cache.put(listing_id, scraped_data)
     return scraped_data
 
-def parse_natural_date(date_input: str) -> str:
-    """Parse natural language dates including relative dates like '3 days ago'."""
-    if not date_input:
-        return datetime.now().date().isoformat()
-    
-    # Use dateparser with settings to handle relative dates properly
-    parsed = dateparser.parse(date_input, settings={
-        "PREFER_DATES_FROM": "past",
-        "RELATIVE_BASE": datetime.now()
-    })
-    
-    if parsed:
-        return parsed.date().isoformat()
-    else:
-        return datetime.now().date().isoformat()
+@traced("job.scrape")
+def run_scrape_job(payload: dict) -> dict:
+    """Background job: scrape one listing and create its Notion entry."""
+    url = payload["url"]
+    scraped_data = scrape_daft_ie(url, force_refresh=payload.get("force_refresh", False))
+    if not scraped_data:
+        raise ValueError("Could not extract details from the website. It might be an unsupported page format.")
+    scraped_data.update(website_link=url, status=payload.get("status", "Applied"), application_date=payload.get("application_date"))
+    _, duplicate = upsert_notion_page(scraped_data, preserve=tuple(payload.get("preserve", ())))
+    result = {key: scraped_data.get(key) for key in ("property_name", "dublin_zone", "price", "application_date")}
+    result["updated_existing"] = duplicate[1] if duplicate else None
+    return result
+
+@st.cache_resource
+@timed_service("Job queue")
+def get_job_queue() -> JobQueue:
+    """Process-wide background worker pool with a persistent SQLite job table."""
+    queue = JobQueue(
+        os.path.join(DATA_DIR, "jobs.sqlite3"),
+        handlers={"scrape": run_scrape_job},
+        workers=JOB_WORKERS,
+        max_attempts=JOB_MAX_ATTEMPTS,
+    )
+    queue.start()
+    return queue
+
+def submit_scrape_job(url: str, status: str = "Applied", application_date: str = "today", force_refresh: bool = False,
+                      preserve: tuple = (), key: str = None) -> int:
+    """Queues a scrape-and-create job; a listing (or `key`) already in the queue isn't queued twice."""
+    payload = {
+        "url": url,
+        "status": status,
+        # Pin relative dates now so a job that waits in the queue keeps the right day
+        "application_date": parse_natural_date(application_date),
+        "force_refresh": force_refresh,
+        "preserve": list(preserve),
+    }
+    return get_job_queue().submit("scrape", payload, key=key or f"listing:{listing_id_from_url(url) or url}")
+
+def on_watched_listing(search_url: str, listing: dict, changed: bool) -> None:
+    """Saved-search hit: queue the listing as "Not yet applied" without touching tracked entries' status."""
+    submit_scrape_job(
+        listing["url"],
+        status="Not yet applied",
+        force_refresh=changed,
+        preserve=("Status", "Application Date"),
+        # Same key as adding the link by hand, so the two can't race to create duplicate pages;
+        # a price change once the job has finished requeues it
+        key=f"listing:{listing['id']}",
+    )
+
+@st.cache_resource
+@timed_service("Search watcher")
+def get_search_watcher() -> SearchWatcher:
+    """Process-wide saved-search poller, scheduled every WATCH_INTERVAL_MINUTES."""
+    watcher = SearchWatcher(
+        os.path.join(DATA_DIR, "search_watcher.sqlite3"),
+        on_listing=on_watched_listing,
+        max_pages=WATCH_MAX_PAGES,
+    )
+    if WATCH_INTERVAL_MINUTES > 0:
+        watcher.start(WATCH_INTERVAL_MINUTES * 60)
+    return watcher
+
+def extract_daft_urls(text: str) -> list:
+    """Finds every daft.ie link in free text, de-duplicated and in input order."""
+    urls = []
+    for match in DAFT_URL_PATTERN.finditer(text or ""):
+        url = match.group(0).strip('.,;)')  # Clean any trailing punctuation
+        if url not in urls:
+            urls.append(url)
+    return urls
+
+def scrape_many(urls: list, max_workers: int = None, force_refresh: bool = False):
+    """Scrapes several daft.ie URLs in parallel, yielding (url, data, error) as each finishes."""
+    # Resolve shared resources in the script thread; workers only borrow them
+    pool, cache = get_driver_pool(), get_scrape_cache()
+    max_workers = max(1, min(max_workers or BULK_MAX_WORKERS, len(urls) or 1))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(scrape_daft_ie, url, pool, force_refresh, cache): url for url in urls}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                yield url, future.result(), None
+            except Exception as e:
+                yield url, None, e
+
+@st.cache_resource
+@timed_service("Notion mirror")
+def get_notion_mirror() -> NotionMirror:
+    """Process-wide local mirror of the tracker database."""
+    return NotionMirror(os.path.join(DATA_DIR, "notion_mirror.sqlite3"), get_notion(), DATABASE_ID)
         
-def create_notion_page(**kwargs):
-    """Creates a new page in the Notion database with dynamically built properties."""
+def build_notion_properties(**kwargs) -> dict:
+    """Builds the Notion properties payload for a tracker entry."""
     properties = {
         "Property Name": {
             "title": [{"text": {"content": kwargs.get("property_name", "Unknown Property")}}]
@@ -328,85 +329,224 @@ def create_notion_page(**kwargs):
         properties["Location"] = {"rich_text": [{"text": {"content": kwargs.get("location")}}]}
     if kwargs.get("price"):
         properties["Price"] = {"rich_text": [{"text": {"content": str(kwargs.get("price"))}}]}
+        price_eur = kwargs.get("price_eur") or parse_price_eur(str(kwargs.get("price")))
+        if NOTION_PRICE_NUMBER_PROPERTY and price_eur is not None:
+            properties[NOTION_PRICE_NUMBER_PROPERTY] = {"number": price_eur}
     if kwargs.get("dublin_zone"):
         properties["Dublin Zone"] = {"rich_text": [{"text": {"content": kwargs.get("dublin_zone")}}]}
+    return properties
 
-    notion.pages.create(parent={"database_id": DATABASE_ID}, properties=properties)
-
-def update_notion_status(property_name: str, new_status: str) -> str:
-    """Finds a page by property name and updates its status."""
-    search_results = notion.databases.query(database_id=DATABASE_ID, filter={"property": "Property Name", "title": {"contains": property_name}})
-    if not search_results["results"]:
-        raise ValueError(f"No entry found with property name containing: {property_name}")
-    page = search_results["results"][0]
-    page_id = page["id"]
-    title_data = page["properties"].get("Property Name", {}).get("title", [])
-    full_property_name = title_data[0]["text"]["content"] if title_data else property_name
-    notion.pages.update(page_id=page_id, properties={"Status": {"status": {"name": new_status} if new_status in STATUS_OPTIONS else {"name": "Applied"}}})
-    return full_property_name
-
+@traced("notion.create")
+def create_notion_page(**kwargs):
+    """Creates a new page in the Notion database with dynamically built properties."""
+    page = get_notion().pages.create(parent={"database_id": DATABASE_ID}, properties=build_notion_properties(**kwargs))
+    get_notion_mirror().upsert_page(page)  # Write-through so the mirror sees it immediately
+    return page
+
+@st.cache_resource
+def get_dedup_index() -> DedupIndex:
+    """Process-wide duplicate-listing index over the mirror."""
+    return DedupIndex()
+
+def current_dedup_index() -> DedupIndex:
+    """The dedup index, brought up to date with the mirror if it has changed."""
+    mirror = get_notion_mirror()
+    mirror.sync_if_stale(MIRROR_SYNC_SECONDS)
+    index = get_dedup_index()
+    if index.version != mirror.version:
+        version = mirror.version
+        index.sync(mirror.items())  # Only re-indexes pages whose link, name or location changed
+        index.version = version
+    return index
+
+def _index_page(index: DedupIndex, page: dict, record: dict) -> None:
+    index.add(page["id"], record.get("website_link"), record.get("property_name"), record.get("location"))
+
+@traced("notion.upsert")
+def upsert_notion_page(record: dict, preserve: tuple = ()) -> tuple:
+    """Creates a tracker entry, or updates the existing one if the listing is already tracked.
+
+    Returns (page, duplicate) where duplicate is None for a new page, else (page_id, reason).
+    Properties named in `preserve` (e.g. "Status") are left as they are on an existing page.
+    """
+    index = current_dedup_index()
+    duplicate = index.find(record.get("website_link"), record.get("property_name"), record.get("location"))
+    if duplicate is None:
+        page = create_notion_page(**record)
+    else:
+        properties = {name: value for name, value in build_notion_properties(**record).items() if name not in preserve}
+        with get_tracer().span("notion.update"):
+            page = get_notion().pages.update(page_id=duplicate[0], properties=properties)
+        get_notion_mirror().upsert_page(page)
+    _index_page(index, page, record)
+    return page, duplicate
+
+@traced("notion.bulk_write")
+def create_notion_pages(records: list, on_result=None, preserve: tuple = ()) -> list:
+    """Creates or updates many pages concurrently under Notion's rate limit.
+
+    Listings already in the tracker are updated instead of duplicated, and repeats within
+    the batch are skipped. `on_result(index, result, duplicate)` fires per record as it
+    finishes; the return value holds the page, exception or None (skipped) for each record.
+    """
+    from notion_async import run_bulk_create, run_bulk_update
+    mirror, index = get_notion_mirror(), current_dedup_index()
+    duplicates = index.dedupe(records)
+    results = [None] * len(records)
+    new = [i for i, duplicate in enumerate(duplicates) if duplicate is None]
+    existing = [i for i, duplicate in enumerate(duplicates) if duplicate is not None and not isinstance(duplicate[0], int)]
+
+    def recorder(positions):
+        def record_result(position, result):
+            i = positions[position]
+            results[i] = result
+            if not isinstance(result, Exception):
+                mirror.upsert_page(result)
+                _index_page(index, result, records[i])
+            if on_result:
+                on_result(i, result, duplicates[i])
+        return record_result
+
+    for i, duplicate in enumerate(duplicates):
+        if duplicate is not None and isinstance(duplicate[0], int) and on_result:
+            on_result(i, None, duplicate)
+
+    writer_options = {"rate": NOTION_RATE_PER_SECOND, "max_concurrency": NOTION_MAX_CONCURRENCY}
+    if new:
+        run_bulk_create(
+            st.secrets["NOTION_API_KEY"], DATABASE_ID,
+            [build_notion_properties(**records[i]) for i in new],
+            on_result=recorder(new), **writer_options,
+        )
+    if existing:
+        updates = []
+        for i in existing:
+            properties = {name: value for name, value in build_notion_properties(**records[i]).items() if name not in preserve}
+            updates.append((duplicates[i][0], properties))
+        run_bulk_update(st.secrets["NOTION_API_KEY"], DATABASE_ID, updates, on_result=recorder(existing), **writer_options)
+    return results
+
+@st.cache_resource(max_entries=1)
+def get_name_index(mirror_version: int) -> NameIndex:
+    """Token and trigram index over property names, rebuilt only when the mirror changes."""
+    return NameIndex(get_notion_mirror().items())
+
+def resolve_property(property_name: str) -> dict:
+    """Best local match for a spoken property name; raises AmbiguousPropertyError on near-ties."""
+    mirror = get_notion_mirror()
+    mirror.sync_if_stale(MIRROR_SYNC_SECONDS)
+    try:
+        return get_name_index(mirror.version).resolve(property_name)
+    except AmbiguousPropertyError:
+        raise
+    except ValueError:
+        # The page may have been added in Notion since the last sync
+        mirror.sync()
+        return get_name_index(mirror.version).resolve(property_name)
+
+@traced("notion.update_status")
+def update_notion_status(property_name: str, new_status: str, page_id: str = None) -> str:
+    """Resolves a property name against the local name index and updates its status in Notion.
+
+    Pass `page_id` to skip the lookup, e.g. once the user has picked from ambiguous matches.
+    """
+    full_property_name = None
+    if page_id is None:
+        with get_tracer().span("notion.resolve_property"):
+            match = resolve_property(property_name)
+        page_id, full_property_name = match["page_id"], match["title"]
+    with get_tracer().span("notion.update"):
+        page = get_notion().pages.update(page_id=page_id, properties={"Status": {"status": {"name": new_status} if new_status in STATUS_OPTIONS else {"name": "Applied"}}})
+    get_notion_mirror().upsert_page(page)
+    return full_property_name or flatten_properties(page.get("properties", {})).get("Property Name") or property_name
+
+@st.cache_resource
+@timed_service("LLM cache")
+def get_llm_cache() -> LLMResponseCache:
+    """Process-wide cache of LLM responses, optionally persisted to disk."""
+    path = os.path.join(DATA_DIR, "llm_cache.sqlite3") if LLM_CACHE_PERSIST else None
+    return LLMResponseCache(max_entries=LLM_CACHE_MAX_ENTRIES, ttl_seconds=LLM_CACHE_TTL_HOURS * 3600, path=path)
+
+def invoke_llm_cached(prompt: str, parse):
+    """Calls the LLM through the response cache; only responses that `parse` accepts are cached."""
+    cache = get_llm_cache()
+    key = cache.key(prompt, today)
+    response = cache.get(key)
+    if response is not None:
+        return parse(response)
+    with get_tracer().span("llm.invoke"):
+        response = get_llm().invoke(prompt).content
+    result = parse(response)
+    cache.put(key, response)
+    return result
+
+@traced("llm.filter")
 def get_filter_from_llm(nl_prompt: str) -> dict:
     """Converts a natural language prompt into a Notion filter and sort JSON object using an LLM."""
     prompt = f"""
     You are an expert system that converts natural language into a Notion API JSON payload.
     The user is querying a house application tracker database for housing in Dublin. Today is {today.isoformat()}.
     DATABASE SCHEMA:
-    - "Property Name": (Title), "Application Date": (Date), "Housing Type Needed": (Select), "Status": (Status), "Location": (Rich Text), "Price": (Rich Text), "Dublin Zone": (Rich Text)
-    Your task is to generate a JSON object with "filter" and "sorts" keys. The "sorts" should ALWAYS sort by "Application Date" in descending order.
+    - "Property Name": (Title), "Application Date": (Date), "Housing Type Needed": (Select), "Status": (Status), "Location": (Rich Text), "Price": (Rich Text), "Dublin Zone": (Rich Text), "Monthly Price": (Number, rent in EUR per month)
+    Your task is to generate a JSON object with "filter" and "sorts" keys. The "sorts" should ALWAYS sort by "Application Date" in descending order, after a "Monthly Price" sort if the user asks for the cheapest or most expensive.
+    ALWAYS filter prices with "Monthly Price" number conditions, never with text matches on "Price".
     EXAMPLES:
     User: "What houses did I apply to last week?"
     Output: {{"filter": {{"and": [{{"property": "Application Date", "date": {{"on_or_after": "{last_week.isoformat()}"}}}}, {{"property": "Status", "status": {{"does_not_equal": "Not yet applied"}}}} ] }}, "sorts": [{{"property": "Application Date", "direction": "descending"}}]}}
     User: "show me applications in Dublin for under 2000 eur"
-    Output: {{"filter": {{"and": [{{"property": "Location", "rich_text": {{"contains": "Dublin"}}}}, {{"property": "Price", "rich_text": {{"contains": "2000"}}}}, {{"property": "Price", "rich_text": {{"contains": "eur"}}}} ] }}, "sorts": [{{"property": "Application Date", "direction": "descending"}}]}}
+    Output: {{"filter": {{"and": [{{"property": "Location", "rich_text": {{"contains": "Dublin"}}}}, {{"property": "Monthly Price", "number": {{"less_than_or_equal_to": 2000}}}} ] }}, "sorts": [{{"property": "Application Date", "direction": "descending"}}]}}
+    User: "cheapest places in D8 between 1500 and 1800"
+    Output: {{"filter": {{"and": [{{"property": "Dublin Zone", "rich_text": {{"equals": "D8"}}}}, {{"property": "Monthly Price", "number": {{"greater_than_or_equal_to": 1500}}}}, {{"property": "Monthly Price", "number": {{"less_than_or_equal_to": 1800}}}} ] }}, "sorts": [{{"property": "Monthly Price", "direction": "ascending"}}, {{"property": "Application Date", "direction": "descending"}}]}}
     User: "show me applications in D1"
     Output: {{"filter": {{"property": "Dublin Zone", "rich_text": {{"contains": "D1"}}}}, "sorts": [{{"property": "Application Date", "direction": "descending"}}]}}
     Now, generate the JSON for the following user request. Only output the JSON object. User: "{nl_prompt}"
     """
-    response = llm.invoke(prompt).content
-    json_str = re.sub(r"```json|```", "", response.strip()).strip()
+    def parse(response: str) -> dict:
+        json_str = re.sub(r"```json|```", "", response.strip()).strip()
+        try:
+            return json.loads(json_str)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"LLM returned invalid JSON. Raw output:\n{response}") from e
+    return invoke_llm_cached(prompt, parse)
+
+@st.cache_resource(max_entries=1)
+def get_query_engine(mirror_version: int) -> LocalQueryEngine:
+    """Indexed in-memory view of the mirror, rebuilt only when the mirror changes."""
+    return LocalQueryEngine(get_notion_mirror().records())
+
+@st.cache_resource(max_entries=1)
+def get_analytics_snapshot(mirror_version: int):
+    """Columnar (pandas) snapshot of the mirror with parsed dates and prices, rebuilt only when the mirror changes."""
+    return build_snapshot(get_notion_mirror().snapshot_items())
+
+@st.cache_resource(max_entries=1)
+def get_snapshot_parquet(mirror_version: int) -> bytes:
+    """The analytics snapshot as a Parquet file, for download."""
+    buffer = io.BytesIO()
+    write_snapshot(get_analytics_snapshot(mirror_version), buffer)
+    return buffer.getvalue()
+
+def stream_notion_query(payload: dict, batch_size: int = QUERY_BATCH_SIZE):
+    """Runs a Notion filter and sort payload against the local mirror, falling back to Notion.
+
+    Yields (columns, rows) batches of tuples as they are ready. Local results arrive in
+    one go and are only batched; the Notion fallback fetches one page of results per
+    batch, so the first rows show before the last page loads.
+    """
+    tracer = get_tracer()
+    mirror = get_notion_mirror()
+    with tracer.span("notion.mirror_sync"):
+        mirror.sync_if_stale(MIRROR_SYNC_SECONDS)
     try:
-        return json.loads(json_str)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"LLM returned invalid JSON. Raw output:\n{response}") from e
-
-def query_notion_database(payload: dict) -> list:
-    """Queries the Notion database using the provided filter and sort payload."""
-    results = notion.databases.query(database_id=DATABASE_ID, **payload)
-    records = []
-    for item in results["results"]:
-        props, record = item["properties"], {}
-        for name, prop_data in props.items():
-            prop_type = prop_data.get("type")
-            value = None
-            if prop_type == "title" and prop_data.get("title"): value = prop_data["title"][0]["text"]["content"]
-            elif prop_type == "rich_text" and prop_data.get("rich_text"): value = prop_data["rich_text"][0]["text"]["content"]
-            elif prop_type == "select" and prop_data.get("select"): value = prop_data["select"]["name"]
-            elif prop_type == "status" and prop_data.get("status"): value = prop_data["status"]["name"]
-            elif prop_type == "date" and prop_data.get("date"): value = prop_data["date"]["start"]
-            elif prop_type == "url" and prop_data.get("url"): value = prop_data["url"]
-            if value is not None: record[name] = value
-        records.append(record)
-    return records
-
-def extract_date_from_text(text: str) -> str:
-    """Extract date expressions from text like 'I applied 3 days ago'."""
-    # Look for relative date patterns
-    relative_patterns = [
-        r'(\d+)\s+days?\s+ago',
-        r'(\d+)\s+weeks?\s+ago', 
-        r'yesterday',
-        r'today',
-        r'last\s+week',
-        r'last\s+month'
-    ]
-    
-    for pattern in relative_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            return match.group(0)
-    
-    return None
-
+        with tracer.span("notion.query_local"):
+            records = get_query_engine(mirror.version).query(payload, today=today)
+    except UnsupportedFilterError:
+        payload = remote_payload(payload, NOTION_PRICE_NUMBER_PROPERTY)
+        yield from iter_query_rows(get_notion(), DATABASE_ID, page_size=min(batch_size, 100), **payload)
+        return
+    yield from iter_record_rows(records, batch_size)
+
+@traced("llm.intent")
 def get_intent_and_payload(nl_prompt: str) -> dict:
     """Uses an LLM to determine intent and extract entities for manual input."""
     prompt = f"""
@@ -435,8 +575,28 @@ def get_intent_and_payload(nl_prompt: str) -> dict:
     
     Now, classify the intent and extract the fields for the following input. Only output the JSON object. Input: "{nl_prompt}"
     """
-    response = llm.invoke(prompt).content.strip()
-    return json.loads(re.sub(r"```json|```", "", response).strip())
+    return invoke_llm_cached(prompt, lambda response: json.loads(re.sub(r"```json|```", "", response.strip()).strip()))
+
+# --- ⚡ RULE-BASED FAST PATH ⚡ ---
+# The regex rules themselves live in intent_rules.py.
+
+@st.cache_resource
+def get_intent_stats() -> dict:
+    """Per-process counters for how inputs were classified."""
+    return {"rules": 0, "llm": 0, "rules_seconds": 0.0, "llm_seconds": 0.0}
+
+@traced("intent.resolve")
+def resolve_intent(nl_prompt: str) -> dict:
+    """Classifies an input with the rule fast path first, then the LLM."""
+    stats = get_intent_stats()
+    started = time.perf_counter()
+    action = classify_intent_fast(nl_prompt)
+    path = "rules" if action else "llm"
+    if action is None:
+        action = get_intent_and_payload(nl_prompt)
+    stats[path] += 1
+    stats[f"{path}_seconds"] += time.perf_counter() - started
+    return action
 
 # --- 🖼️ STREAMLIT UI 🖼️ ---
 
@@ -455,6 +615,7 @@ with st.expander("💡 Example Commands"):
 
 with st.form("notion_form"):
     nl_prompt = st.text_input("💬 What would you like to do?", placeholder="Paste a daft.ie link or type your request...")
+    force_refresh = st.checkbox("Re-scrape links even if cached", value=False)
     submitted = st.form_submit_button("Enter ", use_container_width=True)
 
 if submitted and nl_prompt:
@@ -463,7 +624,7 @@ if submitted and nl_prompt:
     else:
         try:
             # Check for a daft.ie URL first
-            url_match = re.search(r"https?://(www\.)?daft\.ie/[^\s]+", nl_prompt)
+            url_match = DAFT_URL_PATTERN.search(nl_prompt)
 
             if url_match:
                 url = url_match.group(0).strip('.') # Clean any trailing punctuation
@@ -471,56 +632,59 @@ if submitted and nl_prompt:
                 # Extract date from the text if present
                 date_from_text = extract_date_from_text(nl_prompt)
                 
-                with st.spinner(f"🔍 Scraping {url}..."):
-                    scraped_data = scrape_daft_ie(url)
-                
-                if not scraped_data:
-                    st.warning("Could not extract details from the website. It might be an unsupported page format.")
-                else:
-                    # Set the website link to just the URL (not the full input text)
-                    scraped_data['website_link'] = url
-                    scraped_data['status'] = 'Applied'
-                    
-                    # Use the date from text if available, otherwise default to today
-                    if date_from_text:
-                        scraped_data['application_date'] = date_from_text
-                    else:
-                        scraped_data['application_date'] = 'today'
-                    
-                    with st.spinner("✍️ Creating entry in Notion..."):
-                        create_notion_page(**scraped_data)
-                    
-                    # Create success message with key extracted info
-                    zone_info = f" in {scraped_data['dublin_zone']}" if scraped_data.get('dublin_zone') else ""
-                    date_info = f" (applied {scraped_data.get('application_date', 'today')})" if scraped_data.get('application_date') else ""
-                    
-                    st.success(f"✅ Created application for **{scraped_data.get('property_name', 'Unknown Property')}**{zone_info}{date_info}!")
+                # Hand the slow scrape + Notion write to the background workers
+                job_id = submit_scrape_job(
+                    url,
+                    status='Applied',
+                    application_date=date_from_text or 'today',
+                    force_refresh=force_refresh,
+                )
+                st.success(f"📥 Queued **{url}** as job #{job_id}. You can keep going - progress shows below.")
 
             else:
                 # If no URL, use the original AI-based logic
                 with st.spinner("Kareshi is thinking..."):
-                    action = get_intent_and_payload(nl_prompt)
+                    action = resolve_intent(nl_prompt)
                     intent = action.get("intent")
 
                 if intent == "query":
                     with st.spinner("🔍 Searching Notion..."):
-                        notion_payload = get_filter_from_llm(nl_prompt)
-                        records = query_notion_database(notion_payload)
-                    st.success(f"Found **{len(records)}** application(s).")
-                    if records: st.dataframe(records, use_container_width=True)
+                        # The rule fast path already built the filter; only ask the LLM otherwise
+                        notion_payload = action.get("payload") or get_filter_from_llm(nl_prompt)
+                    summary = st.empty()
+                    summary.info("🔍 Searching Notion...")
+                    # Render each batch as it arrives instead of waiting for the whole result
+                    import pandas as pd
+                    table, table_columns, found = None, None, 0
+                    for columns, rows in stream_notion_query(notion_payload):
+                        frame = pd.DataFrame.from_records(rows, columns=columns)
+                        if table is None or columns != table_columns:
+                            table, table_columns = st.dataframe(frame, use_container_width=True), columns
+                        else:
+                            table.add_rows(frame)
+                        found += len(rows)
+                        summary.info(f"🔍 Loaded {found} so far...")
+                    summary.success(f"Found **{found}** application(s).")
 
                 elif intent == "create":
                     with st.spinner("✍️ Creating entry in Notion..."):
-                        create_notion_page(**action)
+                        _, duplicate = upsert_notion_page(action)
                     
                     zone_info = f" in {action.get('dublin_zone')}" if action.get('dublin_zone') else ""
                     date_info = f" (applied {action.get('application_date')})" if action.get('application_date') and action.get('application_date') != datetime.now().date().isoformat() else ""
-                    st.success(f"✅ Application for **{action.get('property_name')}**{zone_info}{date_info} has been created!")
+                    if duplicate:
+                        st.success(f"✅ **{action.get('property_name')}**{zone_info} was already tracked (matched by {duplicate[1]}) - updated the existing entry{date_info}.")
+                    else:
+                        st.success(f"✅ Application for **{action.get('property_name')}**{zone_info}{date_info} has been created!")
 
                 elif intent == "update":
-                    with st.spinner("🔄 Updating status in Notion..."):
-                        full_name = update_notion_status(action["property_name"], action["status"])
-                    st.success(f"✅ Status for **{full_name}** updated to **{action['status']}**!")
+                    try:
+                        with st.spinner("🔄 Updating status in Notion..."):
+                            full_name = update_notion_status(action["property_name"], action["status"])
+                        st.success(f"✅ Status for **{full_name}** updated to **{action['status']}**!")
+                    except AmbiguousPropertyError as e:
+                        # Ask which one was meant rather than guessing
+                        st.session_state["pending_update"] = {"status": action["status"], "query": e.query, "candidates": e.candidates}
                 else:
                     st.warning("⚠️ Could not determine your intent. Please try rephrasing.")
 
@@ -528,5 +692,266 @@ if submitted and nl_prompt:
             st.error(f"❌ An error occurred: {e}")
             st.info("Please check your Notion Database ID, API keys, and that the integration is shared with the database.")
 
+pending_update = st.session_state.get("pending_update")
+if pending_update:
+    with st.form("disambiguate_form"):
+        st.warning(f"🤔 **{pending_update['query']}** matches more than one entry. Which one should be set to **{pending_update['status']}**?")
+        choice = st.radio(
+            "Property",
+            pending_update["candidates"],
+            format_func=lambda candidate: f"{candidate['title']} — {candidate['location'] or 'no location'}",
+        )
+        col_confirm, col_cancel = st.columns(2)
+        confirmed = col_confirm.form_submit_button("Update", use_container_width=True)
+        cancelled = col_cancel.form_submit_button("Cancel", use_container_width=True)
+    if confirmed:
+        try:
+            with st.spinner("🔄 Updating status in Notion..."):
+                full_name = update_notion_status(pending_update["query"], pending_update["status"], page_id=choice["page_id"])
+            st.success(f"✅ Status for **{full_name}** updated to **{pending_update['status']}**!")
+        except Exception as e:
+            st.error(f"❌ An error occurred: {e}")
+        del st.session_state["pending_update"]
+    elif cancelled:
+        del st.session_state["pending_update"]
+        st.rerun()
+
+# --- 📋 BACKGROUND JOBS 📋 ---
+
+@st.fragment(run_every="3s")
+def render_job_panel():
+    job_queue = get_job_queue()
+    jobs = job_queue.recent(limit=15)
+    if not jobs:
+        return
+    counts = job_queue.counts()
+    st.markdown(
+        f"**📋 Background jobs** — {counts.get('queued', 0)} queued, {counts.get('running', 0)} running, "
+        f"{counts.get('done', 0)} done, {counts.get('failed', 0)} failed"
+    )
+    icons = {"queued": "⏳", "running": "🔄", "done": "✅", "failed": "❌"}
+    rows = []
+    for job in jobs:
+        result = job["result"] or {}
+        rows.append({
+            "Job": job["id"],
+            "Status": f"{icons.get(job['status'], '')} {job['status']}",
+            "Link": job["payload"].get("url"),
+            "Property": result.get("property_name"),
+            "Dublin Zone": result.get("dublin_zone"),
+            "Attempts": job["attempts"],
+            "Note": f"Updated existing ({result['updated_existing']})" if result.get("updated_existing") else None,
+            "Error": (job["error"] or "").splitlines()[0] if job["error"] else None,
+        })
+    st.dataframe(rows, use_container_width=True, hide_index=True)
+
+render_job_panel()
+
+# --- 👀 SAVED SEARCHES 👀 ---
+
+with st.expander("👀 Watch daft.ie searches"):
+    watcher = get_search_watcher()
+    st.caption(
+        "Paste a daft.ie search results URL (with your zone, price and beds filters). New listings are added as "
+        "**Not yet applied**" + (f", checked every {WATCH_INTERVAL_MINUTES:g} minutes." if WATCH_INTERVAL_MINUTES > 0 else ".")
+    )
+    with st.form("watch_form", clear_on_submit=True):
+        watch_url = st.text_input("Search URL", placeholder="https://www.daft.ie/property-for-rent/dublin-city?rentalPrice_to=2000")
+        watch_label = st.text_input("Name (optional)")
+        watch_import_existing = st.checkbox("Also add listings already on the results page", value=False)
+        watch_submitted = st.form_submit_button("Watch this search", use_container_width=True)
+    if watch_submitted:
+        if watch_url.startswith(("https://www.daft.ie/", "https://daft.ie/")):
+            watcher.add_search(watch_url.strip(), watch_label or None, import_existing=watch_import_existing)
+            st.success("Saved. It will be checked on the next poll.")
+        else:
+            st.warning("That doesn't look like a daft.ie search URL.")
+
+    saved_searches = watcher.searches()
+    if saved_searches:
+        st.dataframe(
+            [{
+                "Search": search["label"] or search["url"],
+                "Last checked": datetime.fromtimestamp(search["last_polled"]).strftime("%d %b %H:%M") if search["last_polled"] else "pending",
+                "New last time": search["last_found"],
+                "Listings seen": search["seen"],
+                "Error": search["last_error"],
+            } for search in saved_searches],
+            use_container_width=True, hide_index=True,
+        )
+        col_poll, col_remove = st.columns(2)
+        if col_poll.button("Check all now", use_container_width=True):
+            with st.spinner("Checking saved searches..."):
+                found = watcher.poll_all()
+            st.success(f"Queued **{found}** new or changed listing(s).")
+        remove_url = col_remove.selectbox(
+            "Stop watching", [None] + [search["url"] for search in saved_searches],
+            format_func=lambda url: "—" if url is None else next(s["label"] or s["url"] for s in saved_searches if s["url"] == url),
+            label_visibility="collapsed",
+        )
+        if remove_url and col_remove.button("Stop watching", use_container_width=True):
+            watcher.remove_search(remove_url)
+            st.rerun()
+
+# --- 📦 BULK IMPORT 📦 ---
+
+with st.expander("📦 Bulk import daft.ie links"):
+    with st.form("bulk_form"):
+        bulk_text = st.text_area("Paste links (one per line, or any text containing them)", height=150)
+        bulk_file = st.file_uploader("...or upload a file of links", type=["txt", "csv"])
+        bulk_status = st.selectbox("Status for new entries", STATUS_OPTIONS, index=STATUS_OPTIONS.index("Applied"))
+        bulk_date = st.text_input("Application date", value="today")
+        bulk_force_refresh = st.checkbox("Re-scrape links even if cached", value=False, key="bulk_force_refresh")
+        bulk_submitted = st.form_submit_button("Import all", use_container_width=True)
+
+    if bulk_submitted:
+        bulk_input = bulk_text or ""
+        if bulk_file is not None:
+            bulk_input += "\n" + bulk_file.getvalue().decode("utf-8", errors="ignore")
+        urls = extract_daft_urls(bulk_input)
+
+        if not urls:
+            st.warning("No daft.ie links found.")
+        else:
+            progress = st.progress(0.0, text=f"Scraping {len(urls)} listing(s)...")
+            log = st.empty()
+            summary, lines, to_create = [], [], []
+
+            for done, (url, scraped_data, error) in enumerate(scrape_many(urls, force_refresh=bulk_force_refresh), start=1):
+                row = {"Link": url, "Property": None, "Dublin Zone": None, "Result": None}
+                if error or not scraped_data:
+                    row["Result"] = f"❌ {error or 'No details extracted'}"
+                else:
+                    scraped_data.update(website_link=url, status=bulk_status, application_date=bulk_date or "today")
+                    row.update({"Property": scraped_data.get("property_name"), "Dublin Zone": scraped_data.get("dublin_zone"), "Result": "⏳ Scraped"})
+                    to_create.append((row, scraped_data))
+
+                summary.append(row)
+                lines.append(f"{row['Result'][:1]} {url}")
+                log.markdown("  \n".join(lines))
+                progress.progress(done / len(urls), text=f"{done}/{len(urls)} scraped")
+
+            if to_create:
+                written = []
+                progress.progress(0.0, text=f"Writing {len(to_create)} entries to Notion...")
+
+                def on_written(index, result, duplicate):
+                    row = to_create[index][0]
+                    if isinstance(result, Exception):
+                        row["Result"] = f"❌ {result}"
+                    elif duplicate is None:
+                        row["Result"] = "✅ Created"
+                    elif isinstance(duplicate[0], int):
+                        row["Result"] = f"⏭️ Duplicate of {to_create[duplicate[0]][1].get('website_link')}"
+                    else:
+                        row["Result"] = f"✅ Updated existing (matched by {duplicate[1]})"
+                    written.append(index)
+                    progress.progress(len(written) / len(to_create), text=f"{len(written)}/{len(to_create)} written")
+
+                create_notion_pages([record for _, record in to_create], on_result=on_written)
+
+            created = sum(1 for row in summary if row["Result"].startswith("✅"))
+            st.success(f"Imported **{created}** of **{len(urls)}** listing(s).")
+            st.dataframe(summary, use_container_width=True)
+
+# --- 📊 ANALYTICS 📊 ---
+
+with st.expander("📊 Analytics"):
+    st.caption("Reports run over a local snapshot of the tracker, so they make no Notion calls.")
+    # Expander bodies run on every rerun, so nothing (Notion client, pandas) loads until asked for
+    show_analytics = st.checkbox("Show reports", value=False, key="show_analytics")
+
+    if show_analytics:
+        try:
+            configured = all([DATABASE_ID, st.secrets.get("NOTION_API_KEY")])
+        except FileNotFoundError:  # No secrets file at all
+            configured = False
+    if show_analytics and not configured:
+        st.error("❌ CONFIGURATION ERROR: Please set your DATABASE_ID and NOTION_API_KEY as Secrets in Streamlit Cloud.")
+    elif show_analytics:
+        try:
+            col_sync, col_export = st.columns(2)
+            if col_sync.button("Sync with Notion", use_container_width=True):
+                with st.spinner("Syncing the local mirror..."), get_tracer().span("notion.mirror_sync"):
+                    get_notion_mirror().sync()
+
+            mirror_version = get_notion_mirror().version
+            snapshot = get_analytics_snapshot(mirror_version)
+            if snapshot.empty:
+                st.info("The local mirror is empty - sync with Notion or run a query first.")
+            else:
+                col_export.download_button(
+                    "Export snapshot (.parquet)", data=get_snapshot_parquet(mirror_version),
+                    file_name=f"housing_tracker_{today.isoformat()}.parquet", mime="application/octet-stream",
+                    use_container_width=True,
+                )
+                col_entries, col_applied, col_rent = st.columns(3)
+                col_entries.metric("Entries", len(snapshot))
+                col_applied.metric("Applied", int((snapshot["status"] != "Not yet applied").sum()))
+                prices = snapshot["monthly_price"].dropna()
+                col_rent.metric("Median rent", f"€{prices.median():,.0f}" if len(prices) else "-")
+
+                for title, (report, seconds) in run_reports(snapshot).items():
+                    st.markdown(f"**{title}**")
+                    if report.empty:
+                        st.caption("Not enough data yet.")
+                    else:
+                        st.dataframe(report, use_container_width=True, hide_index=True)
+                    st.caption(f"{1000 * seconds:.1f} ms")
+        except Exception as e:
+            st.error(f"❌ An error occurred: {e}")
+
+with st.sidebar:
+    cache_stats = get_scrape_cache().stats()
+    st.subheader("🗄️ Scrape cache")
+    col_hits, col_misses, col_entries = st.columns(3)
+    col_hits.metric("Hits", cache_stats["hits"])
+    col_misses.metric("Misses", cache_stats["misses"])
+    col_entries.metric("Stored", cache_stats["entries"])
+
+    intent_stats = get_intent_stats()
+    st.subheader("⚡ Intent routing")
+    col_rules, col_llm = st.columns(2)
+    col_rules.metric("Rules", intent_stats["rules"])
+    col_llm.metric("LLM", intent_stats["llm"])
+    for path in ("rules", "llm"):
+        if intent_stats[path]:
+            st.caption(f"{path}: {1000 * intent_stats[f'{path}_seconds'] / intent_stats[path]:.1f} ms avg")
+
+    llm_stats = get_llm_cache().stats()
+    st.subheader("🧠 LLM cache")
+    col_hits, col_misses, col_entries = st.columns(3)
+    col_hits.metric("Hits", llm_stats["hits"])
+    col_misses.metric("Misses", llm_stats["misses"])
+    col_entries.metric("Stored", llm_stats["entries"])
+
+    with st.expander("🔬 Stage timings"):
+        tracer = get_tracer()
+        stage_stats = tracer.stage_stats()
+        if stage_stats:
+            st.dataframe(stage_stats, use_container_width=True, hide_index=True)
+            slow_traces = tracer.slow_traces()
+            st.caption(f"Requests slower than {tracer.slow_seconds:g} s")
+            if slow_traces:
+                st.dataframe(slow_traces, use_container_width=True, hide_index=True)
+            else:
+                st.caption("None so far.")
+            if st.button("Reset timings", use_container_width=True):
+                tracer.clear()
+                st.rerun()
+        else:
+            st.caption("Nothing traced yet in this process.")
+
+    with st.expander("⏱️ Startup & rerun timings"):
+        st.caption(f"This rerun: {1000 * (time.perf_counter() - _script_started):.0f} ms")
+        service_timings = get_service_timings()
+        if service_timings:
+            st.dataframe(
+                [{"Service": name, "First load (ms)": round(seconds * 1000, 1)} for name, seconds in service_timings.items()],
+                use_container_width=True, hide_index=True,
+            )
+        else:
+            st.caption("No services loaded yet in this process.")
+
 st.markdown("---")
 st.markdown("<div style='text-align: center;'>I love you bb</div>", unsafe_allow_html=True)
@@ -0,0 +1,292 @@
+"""Offline benchmarks for the tracker's hot paths.
+
+Replays recorded fixtures (bench_fixtures/): saved daft.ie listing and search pages,
+canned LLM responses and a fake Notion API serving synthetic tracker rows, so it
+needs no network or API keys.
+
+    python bench.py                         # 10, 1k and 100k rows
+    python bench.py --sizes 10,1000 --only filter,notion
+    python bench.py --json results.json     # machine-readable, e.g. to diff in CI
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from address_normaliser import SAMPLE_ADDRESSES, normalise_address, normalise_many
+from daft_parser import build_listing_record, extract_listing_fields, parse_listing_dom, parse_next_data
+from dedup import DedupIndex
+from intent_rules import classify_intent_fast
+from llm_cache import LLMResponseCache
+from name_index import NameIndex
+from notion_filter import LocalQueryEngine
+from notion_mirror import NotionMirror, flatten_properties, iter_database_pages
+from search_watcher import parse_search_results
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_fixtures")
+DEFAULT_SIZES = (10, 1000, 100000)
+DATABASE_ID = "bench-database"
+TODAY = date(2025, 9, 1)  # Fixed so date filters select the same rows on every run
+
+STATUSES = ["Not yet applied", "Applied", "Rejected", "Accepted", "Interview/Tour", "Waitlisted"]
+HOUSING_TYPES = ["Studio", "1 Bedroom", "2 Bedroom", "3 Bedroom+", "House"]
+NAME_WORDS = ["Spencer", "Griffith", "Hendrick", "Castle", "Tolka", "Synge", "Charlemont", "Herberton", "Leeson",
+              "Maple", "Oak", "Liffey", "Grand", "Canal", "Harbour", "Fitzwilliam", "Ormond", "Mountjoy", "Rathmines"]
+NAME_SUFFIXES = ["House", "Court", "Wood", "Gate", "Square", "Lodge", "Gardens", "Quay", "Place", "Road"]
+AREAS = ["IFSC", "Drumcondra", "Smithfield", "Portobello", "Rathmines", "Ranelagh", "Phibsborough", "Stoneybatter"]
+
+# Inputs the rule fast path should settle, plus a few it must hand to the LLM
+INTENT_PROMPTS = [
+    "Maple Gardens rejected my application",
+    "I got accepted by Spencer House",
+    "mark Griffith Wood as waitlisted",
+    "I applied to Sunset Apartments for a 2 bed 3 days ago",
+    "show me all accepted applications",
+    "show me applications in D8 under €2,000 per month",
+    "cheapest places in Dublin 1 between 1500 and 1800",
+    "what did I apply to last week",
+    "I applied to the 2 bed on Charlemont Square for €2,300 a month, Dublin 2, yesterday",
+    "which places near the canal did I hear nothing back from",
+]
+QUERY_PAYLOADS = [
+    {"filter": {"property": "Status", "status": {"equals": "Accepted"}}, "sorts": [{"property": "Application Date", "direction": "descending"}]},
+    {"filter": {"and": [{"property": "Dublin Zone", "rich_text": {"equals": "D8"}}, {"property": "Monthly Price", "number": {"less_than_or_equal_to": 2000}}]},
+     "sorts": [{"property": "Monthly Price", "direction": "ascending"}]},
+    {"filter": {"property": "Application Date", "date": {"on_or_after": (TODAY - timedelta(days=7)).isoformat()}},
+     "sorts": [{"property": "Application Date", "direction": "descending"}]},
+    {"filter": {"property": "Location", "rich_text": {"contains": "Portobello"}}, "sorts": [{"property": "Application Date", "direction": "descending"}]},
+]
+
+
+def read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+# --- synthetic data ---
+
+def synthetic_records(count: int, seed: int = 7) -> list:
+    """Tracker rows shaped like the flattened Notion records."""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        zone = rng.randint(1, 24)
+        name = f"{rng.choice(NAME_WORDS)} {rng.choice(NAME_SUFFIXES)}"
+        price = rng.randrange(1200, 3600, 25)
+        records.append({
+            "Property Name": name,
+            "Application Date": (TODAY - timedelta(days=rng.randint(0, 180))).isoformat(),
+            "Status": rng.choice(STATUSES),
+            "Housing Type Needed": rng.choice(HOUSING_TYPES),
+            "Location": f"{rng.randint(1, 120)} {name}, {rng.choice(AREAS)}, Dublin {zone}",
+            "Dublin Zone": f"D{zone}",
+            "Price": f"€{price:,} per month",
+            "Website Link": f"https://www.daft.ie/for-rent/{name.lower().replace(' ', '-')}/{5000000 + i}",
+        })
+    return records
+
+
+def _text(content: str) -> list:
+    return [{"type": "text", "text": {"content": content}, "plain_text": content}]
+
+
+def to_notion_page(index: int, record: dict) -> dict:
+    """A Notion API page object for a synthetic record."""
+    return {
+        "object": "page",
+        "id": f"page-{index:08d}",
+        "last_edited_time": f"{record['Application Date']}T12:{index % 60:02d}:00.000Z",
+        "archived": False,
+        "properties": {
+            "Property Name": {"id": "title", "type": "title", "title": _text(record["Property Name"])},
+            "Application Date": {"id": "a", "type": "date", "date": {"start": record["Application Date"], "end": None}},
+            "Status": {"id": "b", "type": "status", "status": {"name": record["Status"]}},
+            "Housing Type Needed": {"id": "c", "type": "select", "select": {"name": record["Housing Type Needed"]}},
+            "Location": {"id": "d", "type": "rich_text", "rich_text": _text(record["Location"])},
+            "Dublin Zone": {"id": "e", "type": "rich_text", "rich_text": _text(record["Dublin Zone"])},
+            "Price": {"id": "f", "type": "rich_text", "rich_text": _text(record["Price"])},
+            "Website Link": {"id": "g", "type": "url", "url": record["Website Link"]},
+            "Contact Information": {"id": "h", "type": "rich_text", "rich_text": []},
+        },
+    }
+
+
+class FakeNotionClient:
+    """Just enough of notion_client.Client to serve paginated queries from memory.
+
+    Filters and sorts are ignored: the mirror's incremental filter only narrows the
+    result set, and every benchmark here walks the whole database.
+    """
+
+    class _Databases:
+        def __init__(self, pages):
+            self._pages = pages
+
+        def query(self, database_id: str, page_size: int = 100, start_cursor: str = None, **_):
+            start = int(start_cursor or 0)
+            end = start + min(page_size, 100)
+            # Responses are JSON on the wire; copy so callers can't share state between calls
+            results = json.loads(json.dumps(self._pages[start:end]))
+            has_more = end < len(self._pages)
+            return {"object": "list", "results": results, "has_more": has_more, "next_cursor": str(end) if has_more else None}
+
+    def __init__(self, pages: list):
+        self.databases = self._Databases(pages)
+
+
+# --- harness ---
+
+def measure(function, repeat: int) -> tuple:
+    """Best wall time of `repeat` runs, then peak traced memory (MB) of one more run."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    gc.collect()
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak / 1e6
+
+
+def benchmarks(size: int, groups=None) -> list:
+    """(group, name, items processed, function) for one dataset size.
+
+    Only the data for the requested `groups` (default: all) is built, so `--only scrape`
+    doesn't pay for a 100k-row dedup or name index.
+    """
+    built = {}
+
+    def shared(key, build):
+        if key not in built:
+            built[key] = build()
+        return built[key]
+
+    def records():
+        return shared("records", lambda: synthetic_records(size))
+
+    def pages():
+        return shared("pages", lambda: [to_notion_page(i, record) for i, record in enumerate(records())])
+
+    def items():
+        return ((page["id"], record) for page, record in zip(pages(), records()))
+
+    def scrape():
+        listing_html = read_fixture("listing.html")
+        dom_only_html = read_fixture("listing_dom_only.html")
+        search_html = read_fixture("search_results.html")
+        raw_listing = parse_next_data(listing_html)
+        return [
+            ("extract_fields (__NEXT_DATA__)", size, lambda: [extract_listing_fields(listing_html) for _ in range(size)]),
+            ("parse_listing_dom (markup)", size, lambda: [parse_listing_dom(dom_only_html) for _ in range(size)]),
+            ("build_listing_record", size, lambda: [build_listing_record("https://www.daft.ie/for-rent/x-2-bedroom/1", raw_listing) for _ in range(size)]),
+            ("parse_search_results", size, lambda: [parse_search_results(search_html) for _ in range(size)]),
+        ]
+
+    def address():
+        addresses = [f"Apartment {i % 40 + 1}, {record['Location']}" for i, record in enumerate(records())]
+        return [
+            ("normalise_address", size, lambda: [normalise_address(address) for address in addresses]),
+            ("normalise_many (repeats)", size, lambda: normalise_many(SAMPLE_ADDRESSES[i % len(SAMPLE_ADDRESSES)] for i in range(size))),
+        ]
+
+    def intent():
+        prompts = [INTENT_PROMPTS[i % len(INTENT_PROMPTS)] for i in range(size)]
+        canned = json.loads(read_fixture("llm_responses.json"))
+        llm_cache = LLMResponseCache(max_entries=64)
+        replayed = [(prompt, response) for group in canned.values() for prompt, response in group.items()]
+        for prompt, response in replayed:
+            llm_cache.put(llm_cache.key(prompt, TODAY), response)
+        replay_prompts = [replayed[i % len(replayed)][0] for i in range(size)]
+
+        def replay_llm():
+            for prompt in replay_prompts:
+                response = llm_cache.get(llm_cache.key(prompt, TODAY))
+                json.loads(re.sub(r"```json|```", "", response.strip()).strip())
+
+        return [
+            ("classify_intent_fast", size, lambda: [classify_intent_fast(prompt) for prompt in prompts]),
+            ("llm replay (cache hit + parse)", size, replay_llm),
+        ]
+
+    def notion():
+        client = FakeNotionClient(pages())
+
+        def sync_mirror():
+            with tempfile.TemporaryDirectory() as tmp:
+                NotionMirror(os.path.join(tmp, "mirror.sqlite3"), client, DATABASE_ID).sync(full=True)
+
+        return [
+            ("flatten_properties", size, lambda: [flatten_properties(page["properties"]) for page in pages()]),
+            ("paginate + flatten (remote query)", size,
+             lambda: [flatten_properties(page["properties"]) for page in iter_database_pages(client, DATABASE_ID)]),
+            ("mirror full sync", size, sync_mirror),
+        ]
+
+    def filter_():
+        engine = LocalQueryEngine(records())
+        return [
+            ("build LocalQueryEngine", size, lambda: LocalQueryEngine(records())),
+            (f"query x{len(QUERY_PAYLOADS)}", size * len(QUERY_PAYLOADS),
+             lambda: [engine.query(payload, today=TODAY) for payload in QUERY_PAYLOADS]),
+        ]
+
+    def lookup():
+        dedup_index = DedupIndex()
+        dedup_index.sync(items())
+        name_index = NameIndex(items())
+        sample = records()[:100]
+        return [
+            ("DedupIndex build", size, lambda: DedupIndex().sync(items())),
+            ("DedupIndex find x100", 100, lambda: [dedup_index.find(None, record["Property Name"], record["Location"]) for record in sample]),
+            ("NameIndex search x100", 100, lambda: [name_index.search(record["Property Name"]) for record in sample]),
+        ]
+
+    builders = {"scrape": scrape, "address": address, "intent": intent, "notion": notion, "filter": filter_, "lookup": lookup}
+    return [
+        (group, name, count, function)
+        for group, build in builders.items() if not groups or group in groups
+        for name, count, function in build()
+    ]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the tracker's hot paths.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="comma-separated row counts")
+    parser.add_argument("--only", default="", help="comma-separated groups to run (scrape, address, intent, notion, filter, lookup)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark; the best is reported")
+    parser.add_argument("--json", dest="json_path", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    groups = {group for group in args.only.split(",") if group}
+    results = []
+    print(f"{'benchmark':<44}{'rows':>8}{'time (ms)':>12}{'items/s':>14}{'peak MB':>10}")
+    for size in sizes:
+        for group, name, items, function in benchmarks(size, groups):
+            # Big datasets make the slow paths take seconds; one timed run is enough there
+            seconds, peak_mb = measure(function, args.repeat if size < 100000 else 1)
+            result = {"group": group, "name": name, "rows": size, "seconds": seconds,
+                      "items_per_second": items / seconds if seconds else None, "peak_mb": peak_mb}
+            results.append(result)
+            print(f"{group + '.' + name:<44}{size:>8}{seconds * 1000:>12.2f}{result['items_per_second']:>14,.0f}{peak_mb:>10.1f}")
+        print()
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
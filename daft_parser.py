@@ -0,0 +1,239 @@
+import json
+import re
+from html.parser import HTMLParser
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from address_normaliser import normalise_address
+from price_parser import parse_price_eur
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36"
+
+# Where each raw field lives on a rendered listing page: CSS selectors, best first.
+# Add a selector here and both the browser and the HTML extractors pick it up.
+LISTING_FIELD_SELECTORS = {
+    "price": ['[data-testid="price"]'],
+    "address": ['[data-testid="address"]'],
+    "beds": ['[data-testid="beds"]'],
+    "contact": [
+        '[data-testid="agent-name"]',
+        '.agent-name',
+        '[data-testid="contact-name"]',
+        '.contact-name',
+        '.agent-details h3',
+        '.agent-details h4',
+        '.contact-details h3',
+        '.contact-details h4',
+    ],
+}
+# Last resort for the contact: whatever follows a "Contact"/"Agent" label
+CONTACT_LABEL_XPATH = "//*[contains(text(), 'Contact') or contains(text(), 'Agent')]/following-sibling::*"
+
+TEST_ID_SELECTOR_PATTERN = re.compile(r'^\[data-testid="([^"]+)"\]$')
+# data-testid nodes the HTML parser reads, mapped to our raw field names
+LISTING_TEST_IDS = {
+    match.group(1): field
+    for field, selectors in LISTING_FIELD_SELECTORS.items()
+    for match in map(TEST_ID_SELECTOR_PATTERN.match, selectors) if match
+}
+
+# Runs in the page: first non-empty text for each field's selectors, in a single WebDriver call
+BROWSER_EXTRACT_SCRIPT = """
+const spec = arguments[0], labelXPath = arguments[1];
+const fields = {};
+for (const [field, selectors] of Object.entries(spec)) {
+    for (const selector of selectors) {
+        let element = null;
+        try { element = document.querySelector(selector); } catch (e) { continue; }
+        const text = element ? (element.innerText || "").trim() : "";
+        if (text) { fields[field] = text; break; }
+    }
+}
+if (!fields.contact && labelXPath) {
+    const found = document.evaluate(labelXPath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (let i = 0; i < found.snapshotLength; i++) {
+        const text = (found.snapshotItem(i).innerText || "").trim();
+        if (text.length > 2 && text.length < 50) { fields.contact = text; break; }
+    }
+}
+return fields;
+"""
+
+NEXT_DATA_PATTERN = re.compile(r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL)
+LISTING_ID_PATTERN = re.compile(r"/(\d+)/?(?:[?#].*)?$")
+
+# Elements that never have a closing tag, so they must not go on the open-tag stack
+VOID_ELEMENTS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=1)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml",
+        "Accept-Language": "en-IE,en;q=0.9",
+    })
+    return session
+
+# One keep-alive connection pool shared by every fetch in the process
+http_session = _build_session()
+
+
+def listing_id_from_url(url: str) -> str:
+    """Returns the numeric daft.ie listing ID at the end of a URL, e.g. '5987932'."""
+    match = LISTING_ID_PATTERN.search(url or "")
+    return match.group(1) if match else None
+
+
+def fetch_listing_html(url: str, timeout: float = 10) -> str:
+    """Fetches the raw server-rendered HTML of a listing page."""
+    response = http_session.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.text
+
+
+def parse_next_data(html: str) -> dict:
+    """Reads listing fields from the embedded __NEXT_DATA__ JSON blob."""
+    match = NEXT_DATA_PATTERN.search(html)
+    if not match:
+        return {}
+    try:
+        data = json.loads(match.group(1))
+    except json.JSONDecodeError:
+        return {}
+
+    listing = data.get("props", {}).get("pageProps", {}).get("listing") or {}
+    if not listing:
+        return {}
+
+    seller = listing.get("seller") or {}
+    fields = {
+        "price": listing.get("price"),
+        "address": listing.get("title"),
+        "beds": listing.get("numBedrooms"),
+        "contact": seller.get("name") or seller.get("branch"),
+    }
+    return {key: str(value).strip() for key, value in fields.items() if value}
+
+
+class _TestIdTextParser(HTMLParser):
+    """Collects the text of the first element carrying each wanted data-testid."""
+
+    def __init__(self, wanted: dict):
+        super().__init__(convert_charrefs=True)
+        self.wanted = wanted
+        self.found = {}
+        self._stack = []     # (tag, field name or None) for each open element
+        self._buffers = {}   # field name -> text pieces while its element is open
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_ELEMENTS:
+            return
+        field = self.wanted.get(dict(attrs).get("data-testid"))
+        if field in self.found or field in self._buffers:
+            field = None
+        if field:
+            self._buffers[field] = []
+        self._stack.append((tag, field))
+
+    def handle_endtag(self, tag):
+        if not any(open_tag == tag for open_tag, _ in self._stack):
+            return
+        while self._stack:
+            open_tag, field = self._stack.pop()
+            if field:
+                text = " ".join(self._buffers.pop(field))
+                self.found[field] = re.sub(r"\s+,", ",", text)
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        piece = " ".join(data.split())
+        if piece:
+            for pieces in self._buffers.values():
+                pieces.append(piece)
+
+
+def parse_listing_dom(html: str) -> dict:
+    """Reads listing fields from the data-testid nodes in the page markup."""
+    parser = _TestIdTextParser(LISTING_TEST_IDS)
+    parser.feed(html)
+    parser.close()
+    return {key: value for key, value in parser.found.items() if value}
+
+
+def extract_rendered_fields(driver, spec: dict = None) -> dict:
+    """Raw listing fields from a page open in a WebDriver, read in one execute_script round trip."""
+    fields = driver.execute_script(BROWSER_EXTRACT_SCRIPT, spec or LISTING_FIELD_SELECTORS, CONTACT_LABEL_XPATH) or {}
+    return {key: str(value).strip() for key, value in fields.items() if value}
+
+
+def extract_listing_fields(html: str) -> dict:
+    """Raw listing fields (price, address, beds, contact) from page HTML, JSON first."""
+    fields = parse_next_data(html)
+    if not all(fields.get(key) for key in ("price", "address", "beds", "contact")):
+        for key, value in parse_listing_dom(html).items():
+            fields.setdefault(key, value)
+    return fields
+
+
+def build_listing_record(url: str, raw: dict) -> dict:
+    """Turns raw listing fields (price, address, beds, contact) into a tracker record."""
+    scraped_data = {}
+
+    # Extract Price
+    if raw.get('price'):
+        scraped_data['price'] = raw['price'].replace(" per month", "").strip()
+        # Parse from the raw text, which still says whether it's per week or per month
+        price_eur = parse_price_eur(raw['price'])
+        if price_eur is not None:
+            scraped_data['price_eur'] = price_eur
+    else:
+        scraped_data['price'] = "Price not found"
+
+    # Extract Address, Property Name and Dublin Zone
+    if raw.get('address'):
+        scraped_data.update(normalise_address(raw['address']))
+    else:
+        scraped_data['property_name'] = "Unknown Property"
+        scraped_data['location'] = "Location not found"
+        
+    # Extract Housing Type from URL or page content
+    try:
+        # First try to get from URL
+        housing_type = None
+        url_lower = url.lower()
+        
+        if 'studio' in url_lower:
+            housing_type = 'Studio'
+        elif '1-bedroom' in url_lower or '1bedroom' in url_lower:
+            housing_type = '1 Bedroom'
+        elif '2-bedroom' in url_lower or '2bedroom' in url_lower:
+            housing_type = '2 Bedroom'
+        elif '3-bedroom' in url_lower or '3bedroom' in url_lower or 'bedroom' in url_lower and '3' in url_lower:
+            housing_type = '3 Bedroom+'
+        
+        # If not found in URL, try to get from beds element
+        if not housing_type:
+            beds_text = (raw.get('beds') or '').lower()
+            if 'studio' in beds_text:
+                housing_type = 'Studio'
+            elif '1' in beds_text and 'bed' in beds_text:
+                housing_type = '1 Bedroom'
+            elif '2' in beds_text and 'bed' in beds_text:
+                housing_type = '2 Bedroom'
+            elif '3' in beds_text and 'bed' in beds_text:
+                housing_type = '3 Bedroom+'
+        
+        if housing_type:
+            scraped_data['housing_type'] = housing_type
+            
+    except Exception: pass
+
+    scraped_data['contact_info'] = raw.get('contact') or "Contact info not found"
+
+    return scraped_data
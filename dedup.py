@@ -0,0 +1,193 @@
+import hashlib
+import re
+import threading
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+from daft_parser import listing_id_from_url
+
+# Words that don't help tell two properties apart
+FINGERPRINT_STOPWORDS = {"apartment", "apartments", "apt", "flat", "flats", "unit", "studio", "house", "the", "co", "dublin", "ireland", "bedroom", "bed"}
+# Street-type abbreviations expanded so "Griffith Ave" and "Griffith Avenue" fingerprint the same
+FINGERPRINT_ABBREVIATIONS = {"ave": "avenue", "st": "street", "rd": "road", "sq": "square", "ct": "court", "pk": "park", "upr": "upper", "lwr": "lower"}
+
+MINHASH_PERMUTATIONS = 24
+MINHASH_BANDS = 6  # 6 bands x 4 rows: pairs above ~0.65 similarity almost always share a bucket
+# One 64-bit hash per shingle, XORed with a fixed mask per permutation
+_MINHASH_MASKS = [int.from_bytes(hashlib.blake2b(str(i).encode(), digest_size=8).digest(), "big") for i in range(MINHASH_PERMUTATIONS)]
+
+
+def canonical_url(url: str) -> str:
+    """Scheme-, www-, query- and trailing-slash-insensitive form of a listing URL."""
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return f"{host}{parts.path.rstrip('/').lower()}"
+
+
+def fingerprint(name: str, location: str = None) -> str:
+    """Normalised, order-insensitive token string for a property name + location."""
+    text = f"{name or ''} {location or ''}".lower()
+    tokens = set()
+    for token in re.findall(r"[a-z0-9]+", text):
+        token = FINGERPRINT_ABBREVIATIONS.get(token, token)
+        if token in FINGERPRINT_STOPWORDS:
+            continue
+        tokens.add(token[:-1] if len(token) > 3 and token.endswith("s") and not token.endswith("ss") else token)
+    return " ".join(sorted(tokens))
+
+
+def shingles(text: str, size: int = 3) -> frozenset:
+    text = f" {text} "
+    return frozenset(text[i:i + size] for i in range(max(1, len(text) - size + 1)))
+
+
+@lru_cache(maxsize=65536)
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def minhash(shingle_set: frozenset) -> tuple:
+    hashed = [_shingle_hash(s) for s in shingle_set]
+    return tuple(min(map(mask.__xor__, hashed)) for mask in _MINHASH_MASKS)
+
+
+def _bands(signature: tuple):
+    rows = MINHASH_PERMUTATIONS // MINHASH_BANDS
+    for band in range(MINHASH_BANDS):
+        yield band, signature[band * rows:(band + 1) * rows]
+
+
+class DedupIndex:
+    """Finds an existing tracker entry for a listing before a new one is inserted.
+
+    Checks, in order: daft.ie listing ID, canonical URL, exact name+location
+    fingerprint, then a fuzzy MinHash/LSH match on the fingerprint's trigrams.
+    All lookups are dictionary hits; fuzzy candidates are verified by Jaccard similarity.
+    Name matches never pair two entries whose listing IDs (or URLs) differ: those are
+    different units, often in the same building.
+    """
+
+    def __init__(self, fuzzy_threshold: float = 0.75):
+        self.fuzzy_threshold = fuzzy_threshold
+        self.version = None  # Source version this index reflects, set by the owner
+        self._by_listing_id = {}
+        self._by_url = {}
+        self._by_fingerprint = {}  # fingerprint -> set of page IDs
+        self._buckets = {}
+        self._entries = {}  # page_id -> (keys tuple, MinHash signature)
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _keys(url: str, name: str, location: str) -> tuple:
+        return listing_id_from_url(url), canonical_url(url), fingerprint(name, location)
+
+    @staticmethod
+    def _conflicts(keys: tuple, other: tuple) -> bool:
+        """True when both entries identify their listing and the listings differ."""
+        (listing_id, url_key, _), (other_id, other_url, _) = keys, other
+        if listing_id and other_id:
+            return listing_id != other_id
+        return bool(url_key and other_url and url_key != other_url)
+
+    def add(self, page_id: str, url: str = None, name: str = None, location: str = None) -> None:
+        """Indexes (or re-indexes) one entry."""
+        with self._lock:
+            keys = self._keys(url, name, location)
+            current = self._entries.get(page_id)
+            if current and current[0] == keys:
+                return
+            if current:
+                self.remove(page_id)
+
+            listing_id, url_key, print_key = keys
+            if listing_id:
+                self._by_listing_id[listing_id] = page_id
+            if url_key:
+                self._by_url[url_key] = page_id
+            signature = None
+            if print_key:
+                self._by_fingerprint.setdefault(print_key, set()).add(page_id)
+                signature = minhash(shingles(print_key))
+                for band in _bands(signature):
+                    self._buckets.setdefault(band, set()).add(page_id)
+            self._entries[page_id] = (keys, signature)
+
+    def remove(self, page_id: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(page_id, None)
+            if not entry:
+                return
+            (listing_id, url_key, print_key), signature = entry
+            for index, key in ((self._by_listing_id, listing_id), (self._by_url, url_key)):
+                if key and index.get(key) == page_id:
+                    del index[key]
+            same_print = self._by_fingerprint.get(print_key)
+            if same_print is not None:
+                same_print.discard(page_id)
+                if not same_print:
+                    del self._by_fingerprint[print_key]
+            if signature:
+                for band in _bands(signature):
+                    self._buckets.get(band, set()).discard(page_id)
+
+    def find(self, url: str = None, name: str = None, location: str = None) -> tuple:
+        """Returns (page_id, reason) for an existing entry matching the listing, or None."""
+        with self._lock:
+            keys = self._keys(url, name, location)
+            listing_id, url_key, print_key = keys
+            if listing_id and listing_id in self._by_listing_id:
+                return self._by_listing_id[listing_id], "listing ID"
+            if url_key and url_key in self._by_url:
+                return self._by_url[url_key], "URL"
+            if not print_key:
+                return None
+            for page_id in sorted(self._by_fingerprint.get(print_key, ())):
+                if not self._conflicts(keys, self._entries[page_id][0]):
+                    return page_id, "name and location"
+
+            shingle_set = shingles(print_key)
+            candidates = set()
+            for band in _bands(minhash(shingle_set)):
+                candidates |= self._buckets.get(band, set())
+            best, best_score = None, self.fuzzy_threshold
+            for page_id in candidates:
+                other_keys = self._entries[page_id][0]
+                if self._conflicts(keys, other_keys):
+                    continue
+                # Shingles are cheap to rebuild for the few candidates, so they aren't stored
+                other = shingles(other_keys[2])
+                score = len(shingle_set & other) / len(shingle_set | other)
+                if score >= best_score:
+                    best, best_score = page_id, score
+            return (best, f"similar name and location ({best_score:.0%})") if best else None
+
+    def sync(self, items) -> None:
+        """Brings the index in line with (page_id, record) pairs from the mirror."""
+        with self._lock:
+            seen = set()
+            for page_id, record in items:
+                seen.add(page_id)
+                self.add(page_id, record.get("Website Link"), record.get("Property Name"), record.get("Location"))
+            for page_id in set(self._entries) - seen:
+                self.remove(page_id)
+
+    def dedupe(self, records: list) -> list:
+        """For a batch of create kwargs, the existing page ID (or earlier batch index) each duplicates, else None."""
+        batch = DedupIndex(self.fuzzy_threshold)
+        matches = []
+        for position, record in enumerate(records):
+            fields = (record.get("website_link"), record.get("property_name"), record.get("location"))
+            existing = self.find(*fields)
+            if existing is None:
+                earlier = batch.find(*fields)
+                existing = (int(earlier[0]), earlier[1]) if earlier else None
+            matches.append(existing)
+            batch.add(str(position), *fields)
+        return matches
@@ -0,0 +1,157 @@
+import atexit
+import queue
+import threading
+from contextlib import contextmanager
+
+# Selenium Imports for the headless browser
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+# Use the pre-installed chromium driver on Streamlit Cloud
+CHROMEDRIVER_PATH = "/usr/bin/chromedriver"
+
+
+def build_chrome_options() -> Options:
+    """Headless Chromium options tuned for Streamlit Cloud containers."""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    return chrome_options
+
+
+def new_chrome_driver():
+    """Starts a fresh headless Chromium session."""
+    service = Service(executable_path=CHROMEDRIVER_PATH)
+    return webdriver.Chrome(service=service, options=build_chrome_options())
+
+
+class DriverPool:
+    """A bounded pool of warm browser sessions shared across scrapes.
+
+    Sessions are started lazily (or up front with `warm()`), handed out with
+    `session()`, recycled after `max_pages` pages or when they crash, and all
+    closed when the process exits.
+    """
+
+    def __init__(self, size: int = 2, max_pages: int = 25, factory=new_chrome_driver):
+        self.size = max(1, size)
+        self.max_pages = max(1, max_pages)
+        self._factory = factory
+        self._idle = queue.LifoQueue()  # LIFO keeps the most recently used (hottest) session busy
+        self._lock = threading.Lock()
+        self._pages = {}  # id(driver) -> pages served by that session
+        self._live = 0
+        self._closed = False
+        atexit.register(self.close)
+
+    def warm(self, count: int = None) -> int:
+        """Starts sessions up front so the first scrapes skip the cold start."""
+        target = self.size if count is None else min(count, self.size)
+        started = 0
+        while True:
+            with self._lock:
+                if self._closed or self._live >= target:
+                    return started
+                self._live += 1
+            self._idle.put(self._spawn())
+            started += 1
+
+    def _spawn(self):
+        try:
+            driver = self._factory()
+        except Exception:
+            with self._lock:
+                self._live -= 1
+            raise
+        self._pages[id(driver)] = 0
+        return driver
+
+    def _discard(self, driver) -> None:
+        self._pages.pop(id(driver), None)
+        with self._lock:
+            self._live -= 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _is_healthy(self, driver) -> bool:
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def acquire(self, timeout: float = None):
+        """Takes a healthy session from the pool, starting one if there is room."""
+        while True:
+            if self._closed:
+                raise RuntimeError("Driver pool is closed.")
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_spawn = self._live < self.size
+                    if can_spawn:
+                        self._live += 1
+                if can_spawn:
+                    return self._spawn()
+                try:
+                    driver = self._idle.get(timeout=timeout)
+                except queue.Empty:
+                    raise TimeoutError("No browser session became available in time.") from None
+
+            if self._is_healthy(driver):
+                return driver
+            # Crashed or hung session - drop it and try again
+            self._discard(driver)
+
+    def release(self, driver, broken: bool = False) -> None:
+        """Returns a session to the pool, recycling it if it is worn out or broken."""
+        served = self._pages.get(id(driver), 0) + 1
+        self._pages[id(driver)] = served
+
+        if broken or self._closed or served >= self.max_pages:
+            self._discard(driver)
+            return
+        try:
+            # Drop the previous listing so its DOM and JS heap don't linger in memory
+            driver.get("about:blank")
+        except Exception:
+            self._discard(driver)
+            return
+        self._idle.put(driver)
+
+    @contextmanager
+    def session(self, timeout: float = None):
+        """Context manager that borrows a session for one scrape."""
+        driver = self.acquire(timeout=timeout)
+        broken = False
+        try:
+            yield driver
+        except TimeoutException:
+            # Slow page, not a dead browser - keep the session
+            raise
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            self.release(driver, broken=broken)
+
+    def close(self) -> None:
+        """Quits every idle session; busy ones are quit when they are released."""
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
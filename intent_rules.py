@@ -0,0 +1,251 @@
+import re
+from datetime import date, datetime, timedelta
+
+from price_parser import MONTHLY_PRICE_FIELD, parse_amount
+
+# Rule-based fast path for formulaic inputs ("X rejected my application", "show me
+# everything in D8 under 2000"). Anything the rules can't settle goes to the LLM.
+
+
+def parse_natural_date(date_input: str) -> str:
+    """Parse natural language dates including relative dates like '3 days ago'."""
+    if not date_input:
+        return datetime.now().date().isoformat()
+    
+    # Use dateparser with settings to handle relative dates properly
+    import dateparser
+    parsed = dateparser.parse(date_input, settings={
+        "PREFER_DATES_FROM": "past",
+        "RELATIVE_BASE": datetime.now()
+    })
+    
+    if parsed:
+        return parsed.date().isoformat()
+    else:
+        return datetime.now().date().isoformat()
+
+
+def extract_date_from_text(text: str) -> str:
+    """Extract date expressions from text like 'I applied 3 days ago'."""
+    # Look for relative date patterns
+    relative_patterns = [
+        r'(\d+)\s+days?\s+ago',
+        r'(\d+)\s+weeks?\s+ago', 
+        r'yesterday',
+        r'today',
+        r'last\s+week',
+        r'last\s+month'
+    ]
+    
+    for pattern in relative_patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            return match.group(0)
+    
+    return None
+
+
+# The Status options of the Notion tracker database
+STATUS_OPTIONS = ["Not yet applied", "Applied", "Rejected", "Accepted", "Interview/Tour", "Waitlisted"]
+
+# Other ways people describe a status, besides its own name
+STATUS_SYNONYMS = {
+    "Not yet applied": r"haven'?t\s+applied|not\s+applied",
+    "Rejected": r"declined|turned\s+(?:me\s+)?down|refused",
+    "Accepted": r"approved|successful",
+    "Waitlisted": r"wait-?\s?listed|on\s+(?:the|a)\s+wait-?\s?list",
+    "Interview/Tour": r"interviews?|tours?|viewings?",
+}
+
+# "Not yet applied" precedes "Applied" in STATUS_OPTIONS, so the longer phrase is tried first
+STATUS_PHRASES = {
+    status: "|".join(filter(None, [re.escape(status.lower()).replace("\\ ", r"\s+"), STATUS_SYNONYMS.get(status)]))
+    for status in STATUS_OPTIONS
+}
+STATUS_WORDS = "|".join(f"(?:{pattern})" for pattern in STATUS_PHRASES.values())
+
+UPDATE_PATTERNS = [
+    # "Oak Street House rejected my application"
+    re.compile(rf"^(?P<name>.+?)\s+(?:has\s+|have\s+|just\s+)*(?P<status>{STATUS_WORDS})\s+(?:my\s+application|me|us|our\s+application)[.!]*$", re.IGNORECASE),
+    # "I got rejected by Oak Street House"
+    re.compile(rf"^i\s+(?:got|was|am|have\s+been|'ve\s+been|just\s+got)\s+(?P<status>{STATUS_WORDS})\s+(?:by|at|for|from)\s+(?P<name>.+?)[.!]*$", re.IGNORECASE),
+    # "mark Oak Street House as rejected"
+    re.compile(rf"^(?:mark|set|move|update|change)\s+(?P<name>.+?)\s+(?:as|to)\s+(?P<status>{STATUS_WORDS})[.!]*$", re.IGNORECASE),
+]
+CREATE_PATTERN = re.compile(r"^i\s+(?:just\s+)?applied\s+(?:to|for|at)\s+(?P<rest>.+?)[.!]*$", re.IGNORECASE)
+QUERY_PATTERN = re.compile(r"^(?:show|list|find|get|give|display|what|which|how\s+many|cheapest|most\s+expensive)\b", re.IGNORECASE)
+
+# Anything that needs real entity extraction (prices, addresses, "... on Monday",
+# "... near Ranelagh") is left to the LLM
+CREATE_NEEDS_LLM = re.compile(r"€|\beur\b|\beuro|per\s+(?:month|week)|\bpcm\b|\bp/?m\b|,|\d|\bdublin\b|\bin\s+\w+|\w\s+(?:for|on|near|at)\s+\w", re.IGNORECASE)
+HOUSING_TYPE_PATTERN = re.compile(r"(?:(?:for|in)\s+)?(?:an?\s+)?\b(?:(?P<beds>[1-9])\s*-?\s*bed(?:room)?s?(?P<plus>\+)?|(?P<studio>studio))(?:\s+(?:apartment|flat|unit))?\b", re.IGNORECASE)
+ZONE_PATTERN = re.compile(r"\b(?:in\s+)?(?:d(?P<short>\d{1,2})|dublin\s+(?P<long>\d{1,2}))\b", re.IGNORECASE)
+PRICE_AMOUNT = r"€?\s*(\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?(?:\s*k\b)?)(?:\s*(?:eur(?:os?)?|€))?(?:\s+(?:a|per)\s+month|\s*pcm)?"
+PRICE_BETWEEN_PATTERN = re.compile(rf"\b(?:between|from)\s+{PRICE_AMOUNT}\s+(?:and|to|-)\s+{PRICE_AMOUNT}", re.IGNORECASE)
+PRICE_MAX_PATTERN = re.compile(rf"\b(?:under|below|less\s+than|cheaper\s+than|up\s+to|at\s+most|max(?:imum)?|no\s+more\s+than)\s+{PRICE_AMOUNT}", re.IGNORECASE)
+PRICE_MIN_PATTERN = re.compile(rf"\b(?:over|above|more\s+than|at\s+least|min(?:imum)?)\s+{PRICE_AMOUNT}", re.IGNORECASE)
+PRICE_SORT_PATTERN = re.compile(r"\b(?P<cheap>cheapest|lowest\s+price|least\s+expensive)|(?P<dear>most\s+expensive|priciest|highest\s+price)\b", re.IGNORECASE)
+QUERY_DATE_PATTERN = re.compile(r"\b(?:(?:in\s+|from\s+|since\s+|during\s+)?(?:the\s+)?(?:this|last|past)\s+(?P<span>week|month)|(?:on\s+)?(?P<day>today|yesterday)|(?P<n>\d+)\s+(?P<unit>day|week)s?\s+ago)\b", re.IGNORECASE)
+
+# Filler words a formulaic query may contain without changing its meaning
+QUERY_FILLER = {
+    "show", "list", "find", "get", "give", "display", "what", "which", "how", "many", "me", "all", "my", "the", "a",
+    "of", "i", "did", "do", "have", "has", "been", "was", "were", "are", "is", "that", "to", "for", "with", "any",
+    "applications", "application", "apps", "places", "properties", "property", "listings", "houses", "house",
+    "homes", "ones", "apartments", "flats", "entries", "status", "please", "apply", "got", "in", "at", "on", "where",
+    "from", "since", "everything", "so", "far", "one", "rent", "rents", "price", "prices", "priced", "costing", "eur",
+}
+
+# Pronouns and generic subjects that aren't a property name on their own ("it", "the landlord")
+GENERIC_NAME_WORDS = {
+    "it", "its", "this", "that", "these", "those", "there", "here", "they", "them", "he", "she", "him", "her",
+    "we", "us", "you", "i", "me", "one", "the", "a", "an", "my", "our", "their", "his",
+    "landlord", "landlords", "agent", "agents", "agency", "owner", "owners", "people", "company", "someone",
+    "place", "property", "apartment", "flat", "house", "room", "unit", "listing",
+}
+
+
+def _status_from_phrase(phrase: str) -> str:
+    for status, pattern in STATUS_PHRASES.items():
+        if re.fullmatch(pattern, phrase.strip(), re.IGNORECASE):
+            return status
+    return None
+
+
+def _housing_type_from_match(match) -> str:
+    if match.group("studio"):
+        return "Studio"
+    beds = int(match.group("beds"))
+    return "3 Bedroom+" if beds >= 3 else f"{beds} Bedroom"
+
+
+def _clean_property_name(name: str) -> str:
+    name = re.sub(r"^(?:the\s+)?(?:people|agent|landlord)\s+(?:at|from)\s+", "", name.strip(), flags=re.IGNORECASE)
+    name = name.strip(" .!?\"'")
+    if not name or len(name) > 80 or "http" in name.lower() or len(name.split()) > 8:
+        return None
+    if all(word in GENERIC_NAME_WORDS for word in re.findall(r"[\w']+", name.lower())):
+        return None  # Let the LLM work out what "it" refers to
+    return name
+
+
+def _query_date_clause(match) -> dict:
+    if match.group("span"):
+        days = 7 if match.group("span").lower() == "week" else 30
+        return {"property": "Application Date", "date": {"on_or_after": (date.today() - timedelta(days=days)).isoformat()}}
+    expression = match.group(0)
+    if match.group("unit") and match.group("unit").lower() == "week":
+        return {"property": "Application Date", "date": {"on_or_after": parse_natural_date(expression)}}
+    return {"property": "Application Date", "date": {"equals": parse_natural_date(re.sub(r"^on\s+", "", expression, flags=re.IGNORECASE))}}
+
+
+def build_query_payload_fast(nl_prompt: str) -> dict:
+    """Builds a Notion filter/sorts payload for formulaic queries, or None if it isn't one."""
+    text = nl_prompt.strip().rstrip("?.!")
+    clauses, remaining = [], text
+
+    match = ZONE_PATTERN.search(remaining)
+    if match:
+        zone = f"D{int(match.group('short') or match.group('long'))}"
+        clauses.append({"property": "Dublin Zone", "rich_text": {"equals": zone}})
+        remaining = remaining[:match.start()] + " " + remaining[match.end():]
+
+    match = QUERY_DATE_PATTERN.search(remaining)
+    if match:
+        clauses.append(_query_date_clause(match))
+        remaining = remaining[:match.start()] + " " + remaining[match.end():]
+
+    match = HOUSING_TYPE_PATTERN.search(remaining)
+    if match:
+        clauses.append({"property": "Housing Type Needed", "select": {"equals": _housing_type_from_match(match)}})
+        remaining = remaining[:match.start()] + " " + remaining[match.end():]
+
+    # Price ranges run against the numeric monthly price, not the free-text Price property
+    match = PRICE_BETWEEN_PATTERN.search(remaining)
+    if match:
+        low, high = sorted((parse_amount(match.group(1)), parse_amount(match.group(2))))
+        clauses.append({"property": MONTHLY_PRICE_FIELD, "number": {"greater_than_or_equal_to": low}})
+        clauses.append({"property": MONTHLY_PRICE_FIELD, "number": {"less_than_or_equal_to": high}})
+        remaining = remaining[:match.start()] + " " + remaining[match.end():]
+    for pattern, op in ((PRICE_MAX_PATTERN, "less_than_or_equal_to"), (PRICE_MIN_PATTERN, "greater_than_or_equal_to")):
+        match = pattern.search(remaining)
+        if match:
+            clauses.append({"property": MONTHLY_PRICE_FIELD, "number": {op: parse_amount(match.group(1))}})
+            remaining = remaining[:match.start()] + " " + remaining[match.end():]
+
+    sorts = [{"property": "Application Date", "direction": "descending"}]
+    match = PRICE_SORT_PATTERN.search(remaining)
+    if match:
+        direction = "ascending" if match.group("cheap") else "descending"
+        sorts.insert(0, {"property": MONTHLY_PRICE_FIELD, "direction": direction})
+        remaining = remaining[:match.start()] + " " + remaining[match.end():]
+
+    statuses = []
+    for status, pattern in STATUS_PHRASES.items():
+        if status == "Applied":
+            continue
+        found = re.search(rf"\b(?:{pattern})\b", remaining, re.IGNORECASE)
+        if found:
+            statuses.append(status)
+            remaining = remaining[:found.start()] + " " + remaining[found.end():]
+    if len(statuses) > 1:
+        return None
+    if statuses:
+        clauses.append({"property": "Status", "status": {"equals": statuses[0]}})
+    elif re.search(r"\b(?:applied|apply)\b", remaining, re.IGNORECASE):
+        clauses.append({"property": "Status", "status": {"does_not_equal": "Not yet applied"}})
+    remaining = re.sub(r"\b(?:applied|apply)\b", " ", remaining, flags=re.IGNORECASE)
+
+    # Any word we didn't account for might change the meaning (prices, names, "cheapest"...)
+    leftover = [word for word in re.findall(r"[\w'/+]+", remaining.lower()) if word not in QUERY_FILLER]
+    if leftover:
+        return None
+
+    if not clauses:
+        return {"sorts": sorts}
+    return {"filter": clauses[0] if len(clauses) == 1 else {"and": clauses}, "sorts": sorts}
+
+
+def classify_intent_fast(nl_prompt: str) -> dict:
+    """Settles formulaic inputs with regex rules; returns None when the LLM should decide."""
+    text = " ".join(nl_prompt.split())
+
+    for pattern in UPDATE_PATTERNS:
+        match = pattern.match(text)
+        if match:
+            status = _status_from_phrase(match.group("status"))
+            name = _clean_property_name(match.group("name"))
+            if status and name and status != "Applied" and not name.lower().startswith(("i ", "show ", "what ")):
+                return {"intent": "update", "property_name": name, "status": status}
+
+    match = CREATE_PATTERN.match(text)
+    if match:
+        rest = match.group("rest")
+        date_expression = extract_date_from_text(rest)
+        if date_expression:
+            rest = re.sub(re.escape(date_expression), " ", rest, count=1, flags=re.IGNORECASE)
+        housing_type = None
+        housing_match = HOUSING_TYPE_PATTERN.search(rest)
+        if housing_match:
+            housing_type = _housing_type_from_match(housing_match)
+            rest = rest[:housing_match.start()] + " " + rest[housing_match.end():]
+        if CREATE_NEEDS_LLM.search(rest):
+            return None
+        # Dropping the housing type can leave its connective behind: "for a 2 bed at X", "X for a"
+        rest = re.sub(r"^(?:at|to)\s+|\s+(?:for|on)$", "", " ".join(rest.split()), flags=re.IGNORECASE)
+        name = _clean_property_name(rest)
+        if not name:
+            return None
+        action = {"intent": "create", "property_name": name, "status": "Applied"}
+        if date_expression:
+            action["application_date"] = date_expression
+        if housing_type:
+            action["housing_type"] = housing_type
+        return action
+
+    if QUERY_PATTERN.match(text):
+        payload = build_query_payload_fast(text)
+        if payload is not None:
+            return {"intent": "query", "payload": payload}
+
+    return None
@@ -0,0 +1,172 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class JobQueue:
+    """Persistent background job queue backed by SQLite and run by worker threads.
+
+    Jobs are idempotent on their `key` while in flight: submitting a key that is
+    already queued or running returns the existing job. A done or failed job with
+    that key is queued again with the new payload.
+    Failed attempts are retried with exponential backoff up to `max_attempts`.
+    """
+
+    def __init__(self, path: str, handlers: dict, workers: int = 2, max_attempts: int = 3,
+                 backoff_seconds: float = 5.0, poll_seconds: float = 1.0):
+        self.handlers = handlers
+        self.workers = max(1, workers)
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                key TEXT UNIQUE,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT,
+                run_after REAL NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status_run_after ON jobs (status, run_after);
+        """)
+        # Jobs that were mid-flight when the process died get picked up again
+        self._conn.execute("UPDATE jobs SET status = ? WHERE status = ?", (QUEUED, RUNNING))
+        self._conn.commit()
+
+    # --- producer side ---
+
+    def submit(self, kind: str, payload: dict, key: str = None) -> int:
+        """Queues a job and returns its ID (or the ID of the queued or running job with the same key)."""
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        now = time.time()
+        with self._lock:
+            if key is not None:
+                row = self._conn.execute("SELECT id, status FROM jobs WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    if row["status"] in (DONE, FAILED):
+                        self._conn.execute(
+                            "UPDATE jobs SET status = ?, attempts = 0, result = NULL, error = NULL, payload = ?, run_after = ?, updated_at = ? WHERE id = ?",
+                            (QUEUED, json.dumps(payload), now, now, row["id"]),
+                        )
+                        self._conn.commit()
+                        self._wakeup.set()
+                    return row["id"]
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (kind, key, payload, status, run_after, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, key, json.dumps(payload), QUEUED, now, now, now),
+            )
+            self._conn.commit()
+        self._wakeup.set()
+        return cursor.lastrowid
+
+    def get(self, job_id: int) -> dict:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def recent(self, limit: int = 20) -> list:
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def counts(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    @staticmethod
+    def _to_dict(row) -> dict:
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    # --- worker side ---
+
+    def start(self) -> None:
+        """Starts the worker threads (idempotent)."""
+        if self._threads:
+            return
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def _claim(self):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE status = ? AND run_after <= ? ORDER BY id LIMIT 1", (QUEUED, now)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?", (RUNNING, now, row["id"])
+            )
+            self._conn.commit()
+        job = self._to_dict(row)
+        job["attempts"] += 1
+        return job
+
+    def _finish(self, job: dict, result=None, error: str = None) -> None:
+        now = time.time()
+        with self._lock:
+            if error is None:
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, result = ?, error = NULL, updated_at = ? WHERE id = ?",
+                    (DONE, json.dumps(result), now, job["id"]),
+                )
+            elif job["attempts"] < self.max_attempts:
+                retry_at = now + self.backoff_seconds * (2 ** (job["attempts"] - 1))
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, run_after = ?, updated_at = ? WHERE id = ?",
+                    (QUEUED, error, retry_at, now, job["id"]),
+                )
+            else:
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?", (FAILED, error, now, job["id"])
+                )
+            self._conn.commit()
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            job = self._claim()
+            if job is None:
+                self._wakeup.wait(self.poll_seconds)
+                self._wakeup.clear()
+                continue
+            try:
+                result = self.handlers[job["kind"]](job["payload"])
+            except Exception as e:
+                self._finish(job, error=f"{e}\n{traceback.format_exc(limit=3)}")
+            else:
+                self._finish(job, result=result)
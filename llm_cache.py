@@ -0,0 +1,89 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalise_prompt(text: str) -> str:
+    """Case- and whitespace-insensitive form of a prompt, used for cache keys."""
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+class LLMResponseCache:
+    """Bounded LRU cache of raw LLM responses with a TTL and optional SQLite backing.
+
+    Keys are built from the normalised prompt plus the current date, because the
+    prompts embed relative dates (today, yesterday, last week).
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 24 * 3600, path: str = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (stored_at, response)
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if path:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    stored_at REAL NOT NULL
+                )
+            """)
+            self._conn.commit()
+
+    @staticmethod
+    def key(prompt: str, today) -> str:
+        return hashlib.sha256(f"{today.isoformat()}\n{normalise_prompt(prompt)}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str:
+        """Returns the cached response, or None on a miss or expiry."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._conn is not None:
+                row = self._conn.execute("SELECT stored_at, response FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                if row:
+                    entry = (row[0], row[1])
+                    self._remember(key, entry)
+            if entry is None or now - entry[0] > self.ttl_seconds:
+                if entry is not None:
+                    self._forget(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, response: str) -> None:
+        entry = (time.time(), response)
+        with self._lock:
+            self._remember(key, entry)
+            if self._conn is not None:
+                self._conn.execute("INSERT OR REPLACE INTO llm_cache (key, response, stored_at) VALUES (?, ?, ?)", (key, response, entry[0]))
+                self._conn.execute("DELETE FROM llm_cache WHERE stored_at < ?", (entry[0] - self.ttl_seconds,))
+                self._conn.commit()
+
+    def _remember(self, key: str, entry: tuple) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _forget(self, key: str) -> None:
+        self._entries.pop(key, None)
+        if self._conn is not None:
+            self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
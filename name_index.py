@@ -0,0 +1,105 @@
+import re
+
+# Tokens too common in property names to tell entries apart
+NAME_STOPWORDS = {"the", "a", "an", "at", "in", "of", "apartment", "apartments", "apt", "my", "application"}
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+MIN_MATCH_SCORE = 0.35
+STRONG_MATCH_SCORE = 0.8
+AMBIGUITY_MARGIN = 0.1
+
+
+def name_tokens(text: str) -> set:
+    return {token for token in TOKEN_RE.findall((text or "").lower()) if token not in NAME_STOPWORDS}
+
+
+def trigrams(text: str) -> set:
+    text = " " + " ".join(TOKEN_RE.findall((text or "").lower())) + " "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class AmbiguousPropertyError(ValueError):
+    """Raised when a spoken property name matches several tracker entries about equally well."""
+
+    def __init__(self, query: str, candidates: list):
+        self.query = query
+        self.candidates = candidates
+        names = ", ".join(candidate["title"] for candidate in candidates)
+        super().__init__(f"'{query}' matches several entries: {names}")
+
+
+class NameIndex:
+    """In-memory lookup from a spoken property name to tracker pages.
+
+    Token postings over names and locations find candidates; a trigram index over
+    names catches misspellings and partial words. Candidates are ranked by token
+    overlap (name tokens count double location tokens) plus trigram similarity.
+    """
+
+    def __init__(self, items):
+        self._pages = {}
+        self._token_postings = {}
+        self._trigram_postings = {}
+        for page_id, record in items:
+            title = record.get("Property Name") or ""
+            location = record.get("Location") or ""
+            names, places, grams = name_tokens(title), name_tokens(location), trigrams(title)
+            self._pages[page_id] = (title, location, names, places, grams)
+            for token in names | places:
+                self._token_postings.setdefault(token, set()).add(page_id)
+            for gram in grams:
+                self._trigram_postings.setdefault(gram, set()).add(page_id)
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def _rare(self, postings: list) -> set:
+        # Words like "House" appear in most names; only use them when nothing rarer matched
+        postings = [posting for posting in postings if posting]
+        common = max(32, len(self._pages) // 20)
+        rare = [posting for posting in postings if len(posting) <= common]
+        if rare or not postings:
+            return set().union(*rare)
+        # Only common words: pages having all of them, else the smallest posting
+        return set.intersection(*postings) or min(postings, key=len)
+
+    def _score(self, page_ids, query_tokens: set, query_grams: set) -> list:
+        ranked = []
+        for page_id in page_ids:
+            title, location, names, places, grams = self._pages[page_id]
+            similarity = 2 * len(query_grams & grams) / (len(query_grams) + len(grams)) if grams else 0.0
+            if query_tokens:
+                overlap = (len(query_tokens & names) + 0.5 * len(query_tokens & (places - names))) / len(query_tokens)
+                score = 0.5 * overlap + 0.5 * similarity
+            else:
+                score = similarity
+            if score >= MIN_MATCH_SCORE:
+                ranked.append({"page_id": page_id, "title": title, "location": location, "score": round(score, 3)})
+        ranked.sort(key=lambda candidate: -candidate["score"])
+        return ranked
+
+    def search(self, query: str, limit: int = 5) -> list:
+        """Ranked candidates as dicts with page_id, title, location and score (0-1)."""
+        query_tokens, query_grams = name_tokens(query), trigrams(query)
+        if not query_grams:
+            return []
+        # Whole-word hits first; trigrams only when no word matched well (typos, partial words)
+        seen = self._rare([self._token_postings.get(token, set()) for token in query_tokens])
+        ranked = self._score(seen, query_tokens, query_grams)
+        if not ranked or ranked[0]["score"] < STRONG_MATCH_SCORE:
+            fuzzy = self._rare([self._trigram_postings.get(gram, set()) for gram in query_grams]) - seen
+            ranked = sorted(ranked + self._score(fuzzy, query_tokens, query_grams), key=lambda candidate: -candidate["score"])
+        return ranked[:limit]
+
+    def resolve(self, query: str) -> dict:
+        """The single best candidate for `query`.
+
+        Raises ValueError if nothing matches, AmbiguousPropertyError if the runners-up
+        score within AMBIGUITY_MARGIN of the best match.
+        """
+        candidates = self.search(query)
+        if not candidates:
+            raise ValueError(f"No entry found with property name matching: {query}")
+        close = [c for c in candidates if c["score"] >= candidates[0]["score"] - AMBIGUITY_MARGIN]
+        if len(close) > 1:
+            raise AmbiguousPropertyError(query, close)
+        return candidates[0]
@@ -0,0 +1,122 @@
+import asyncio
+import random
+import time
+
+from notion_client import AsyncClient
+from notion_client.errors import HTTPResponseError, RequestTimeoutError
+
+# Notion allows an average of ~3 requests/second per integration
+NOTION_RATE_PER_SECOND = 3.0
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Async token bucket: `acquire()` waits until a request may be sent."""
+
+    def __init__(self, rate: float = NOTION_RATE_PER_SECOND, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """Stops handing out tokens for a while, e.g. after a 429 with Retry-After."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncNotionWriter:
+    """Concurrent, rate-limited Notion writes with retry on 429 and 5xx responses."""
+
+    def __init__(self, client, database_id: str, rate: float = NOTION_RATE_PER_SECOND,
+                 max_concurrency: int = 3, max_retries: int = 5, backoff_seconds: float = 1.0):
+        self.client = client
+        self.database_id = database_id
+        self.bucket = TokenBucket(rate)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.retries = 0
+
+    def _retry_delay(self, error, attempt: int) -> float:
+        retry_after = getattr(error, "headers", {}) or {}
+        try:
+            return float(retry_after.get("retry-after"))
+        except (TypeError, ValueError):
+            return self.backoff_seconds * (2 ** attempt) * (0.5 + random.random())
+
+    async def _call(self, method, **kwargs):
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            try:
+                async with self._semaphore:
+                    return await method(**kwargs)
+            except (HTTPResponseError, RequestTimeoutError) as e:
+                status = getattr(e, "status", None)
+                retryable = isinstance(e, RequestTimeoutError) or status in RETRYABLE_STATUSES
+                if not retryable or attempt == self.max_retries:
+                    raise
+                delay = self._retry_delay(e, attempt)
+                if status == 429:
+                    self.bucket.pause(delay)
+                self.retries += 1
+                await asyncio.sleep(delay)
+
+    async def create_page(self, properties: dict) -> dict:
+        return await self._call(self.client.pages.create, parent={"database_id": self.database_id}, properties=properties)
+
+    async def update_page(self, page_id: str, properties: dict) -> dict:
+        return await self._call(self.client.pages.update, page_id=page_id, properties=properties)
+
+    async def _gather(self, coroutines, on_result=None) -> list:
+        async def run(index, coroutine):
+            try:
+                result = await coroutine
+            except Exception as e:
+                result = e
+            if on_result:
+                on_result(index, result)
+            return result
+        return await asyncio.gather(*(run(i, c) for i, c in enumerate(coroutines)))
+
+    async def create_pages(self, properties_list: list, on_result=None) -> list:
+        """Creates many pages; returns the page (or the exception) for each input, in order."""
+        return await self._gather([self.create_page(p) for p in properties_list], on_result)
+
+    async def update_pages(self, updates: list, on_result=None) -> list:
+        """Applies (page_id, properties) updates; returns the page (or exception) for each."""
+        return await self._gather([self.update_page(page_id, p) for page_id, p in updates], on_result)
+
+
+def run_bulk_create(auth: str, database_id: str, properties_list: list, on_result=None, **writer_options) -> list:
+    """Synchronous entry point: creates pages over a fresh AsyncClient and returns the results."""
+    async def main():
+        async with AsyncClient(auth=auth) as client:
+            writer = AsyncNotionWriter(client, database_id, **writer_options)
+            return await writer.create_pages(properties_list, on_result)
+    return asyncio.run(main())
+
+
+def run_bulk_update(auth: str, database_id: str, updates: list, on_result=None, **writer_options) -> list:
+    """Synchronous entry point for (page_id, properties) status sweeps."""
+    async def main():
+        async with AsyncClient(auth=auth) as client:
+            writer = AsyncNotionWriter(client, database_id, **writer_options)
+            return await writer.update_pages(updates, on_result)
+    return asyncio.run(main())
@@ -0,0 +1,293 @@
+import bisect
+from datetime import date, timedelta
+
+from price_parser import MONTHLY_PRICE_FIELD
+
+# Properties the engine indexes by default: hash lookups, sorted date ranges and sorted number ranges
+DEFAULT_HASH_INDEXES = ("Status", "Dublin Zone")
+DEFAULT_DATE_INDEXES = ("Application Date",)
+DEFAULT_NUMBER_INDEXES = (MONTHLY_PRICE_FIELD,)
+
+TEXT_TYPES = {"title", "rich_text", "url", "email", "phone_number"}
+CHOICE_TYPES = {"select", "status"}
+DATE_RANGE_OPS = {"before", "after", "on_or_before", "on_or_after", "equals"}
+
+
+class UnsupportedFilterError(ValueError):
+    """Raised for filter clauses the local engine can't evaluate (the caller should ask Notion)."""
+
+
+def _text(value) -> str:
+    return "" if value is None else str(value)
+
+
+def _date_part(value) -> str:
+    return _text(value)[:10]
+
+
+def _text_predicate(name: str, op: str, arg):
+    needle = _text(arg).lower()
+    if op == "equals":
+        return lambda r: _text(r.get(name)) == arg
+    if op == "does_not_equal":
+        return lambda r: _text(r.get(name)) != arg
+    if op == "contains":
+        return lambda r: needle in _text(r.get(name)).lower()
+    if op == "does_not_contain":
+        return lambda r: needle not in _text(r.get(name)).lower()
+    if op == "starts_with":
+        return lambda r: _text(r.get(name)).lower().startswith(needle)
+    if op == "ends_with":
+        return lambda r: _text(r.get(name)).lower().endswith(needle)
+    if op == "is_empty":
+        return lambda r: not r.get(name)
+    if op == "is_not_empty":
+        return lambda r: bool(r.get(name))
+    raise UnsupportedFilterError(f"Unsupported text operator: {op}")
+
+
+def _choice_predicate(name: str, op: str, arg):
+    if op == "equals":
+        return lambda r: r.get(name) == arg
+    if op == "does_not_equal":
+        return lambda r: r.get(name) != arg
+    if op == "is_empty":
+        return lambda r: not r.get(name)
+    if op == "is_not_empty":
+        return lambda r: bool(r.get(name))
+    raise UnsupportedFilterError(f"Unsupported select/status operator: {op}")
+
+
+def _number_predicate(name: str, op: str, arg):
+    def value(r):
+        v = r.get(name)
+        return v if isinstance(v, (int, float)) else None
+
+    comparisons = {
+        "equals": lambda v: v == arg,
+        "does_not_equal": lambda v: v != arg,
+        "greater_than": lambda v: v > arg,
+        "less_than": lambda v: v < arg,
+        "greater_than_or_equal_to": lambda v: v >= arg,
+        "less_than_or_equal_to": lambda v: v <= arg,
+    }
+    if op == "is_empty":
+        return lambda r: value(r) is None
+    if op == "is_not_empty":
+        return lambda r: value(r) is not None
+    if op not in comparisons:
+        raise UnsupportedFilterError(f"Unsupported number operator: {op}")
+    compare = comparisons[op]
+    return lambda r: value(r) is not None and compare(value(r))
+
+
+def date_bounds(op: str, arg, today: date) -> tuple:
+    """Inclusive (low, high) ISO date bounds for a date operator; None means open-ended."""
+    if op == "equals":
+        return _date_part(arg), _date_part(arg)
+    if op == "on_or_after":
+        return _date_part(arg), None
+    if op == "after":
+        return (date.fromisoformat(_date_part(arg)) + timedelta(days=1)).isoformat(), None
+    if op == "on_or_before":
+        return None, _date_part(arg)
+    if op == "before":
+        return None, (date.fromisoformat(_date_part(arg)) - timedelta(days=1)).isoformat()
+    relative = {"past_week": -7, "past_month": -30, "past_year": -365, "next_week": 7, "next_month": 30, "next_year": 365}
+    if op in relative:
+        other = (today + timedelta(days=relative[op])).isoformat()
+        return (other, today.isoformat()) if relative[op] < 0 else (today.isoformat(), other)
+    if op == "this_week":
+        start = today - timedelta(days=today.weekday())
+        return start.isoformat(), (start + timedelta(days=6)).isoformat()
+    raise UnsupportedFilterError(f"Unsupported date operator: {op}")
+
+
+def _date_predicate(name: str, op: str, arg, today: date):
+    if op == "is_empty":
+        return lambda r: not r.get(name)
+    if op == "is_not_empty":
+        return lambda r: bool(r.get(name))
+    low, high = date_bounds(op, arg, today)
+    return lambda r: bool(r.get(name)) and (low is None or _date_part(r[name]) >= low) and (high is None or _date_part(r[name]) <= high)
+
+
+def compile_filter(filter_spec: dict, today: date = None):
+    """Compiles a Notion filter object into a predicate over flattened records."""
+    today = today or date.today()
+    if not filter_spec:
+        return lambda r: True
+
+    if "and" in filter_spec:
+        parts = [compile_filter(f, today) for f in filter_spec["and"]]
+        return lambda r: all(p(r) for p in parts)
+    if "or" in filter_spec:
+        parts = [compile_filter(f, today) for f in filter_spec["or"]]
+        return lambda r: any(p(r) for p in parts)
+
+    name = filter_spec.get("property")
+    if name is None:
+        raise UnsupportedFilterError(f"Unsupported filter: {filter_spec}")
+    prop_types = [key for key in filter_spec if key != "property"]
+    if len(prop_types) != 1 or not isinstance(filter_spec[prop_types[0]], dict) or len(filter_spec[prop_types[0]]) != 1:
+        raise UnsupportedFilterError(f"Unsupported filter: {filter_spec}")
+    prop_type = prop_types[0]
+    (op, arg), = filter_spec[prop_type].items()
+
+    if prop_type in TEXT_TYPES:
+        return _text_predicate(name, op, arg)
+    if prop_type in CHOICE_TYPES:
+        return _choice_predicate(name, op, arg)
+    if prop_type == "date":
+        return _date_predicate(name, op, arg, today)
+    if prop_type == "number":
+        return _number_predicate(name, op, arg)
+    raise UnsupportedFilterError(f"Unsupported property type: {prop_type}")
+
+
+def sort_records(records: list, sorts: list) -> list:
+    """Applies Notion-style multi-key sorts; empty values always sort last."""
+    records = list(records)
+    for sort in reversed(sorts or []):
+        name = sort.get("property")
+        if name is None:
+            raise UnsupportedFilterError(f"Unsupported sort: {sort}")
+        reverse = sort.get("direction") == "descending"
+        present = [r for r in records if r.get(name) not in (None, "")]
+        missing = [r for r in records if r.get(name) in (None, "")]
+        present.sort(key=lambda r: r[name], reverse=reverse)
+        records = present + missing
+    return records
+
+
+def _rename_filter_property(filter_spec: dict, old: str, new: str) -> dict:
+    if not filter_spec:
+        return filter_spec
+    for group in ("and", "or"):
+        if group in filter_spec:
+            return {**filter_spec, group: [_rename_filter_property(f, old, new) for f in filter_spec[group]]}
+    return {**filter_spec, "property": new} if filter_spec.get("property") == old else filter_spec
+
+
+def _filter_properties(filter_spec: dict) -> set:
+    if not filter_spec:
+        return set()
+    if "and" in filter_spec or "or" in filter_spec:
+        return set().union(*(_filter_properties(f) for f in filter_spec.get("and", filter_spec.get("or"))))
+    return {filter_spec.get("property")}
+
+
+def remote_payload(payload: dict, price_property: str = None) -> dict:
+    """The payload to send Notion itself, with the mirror-only Monthly Price mapped to `price_property`.
+
+    Monthly Price is derived from the Price text when pages are mirrored, so Notion
+    only knows it if the database has a Number property for it. Without one, a payload
+    that filters or sorts on it raises ValueError.
+    """
+    if price_property == MONTHLY_PRICE_FIELD:
+        return payload
+    sorts = payload.get("sorts") or []
+    uses_price = MONTHLY_PRICE_FIELD in _filter_properties(payload.get("filter")) or any(
+        sort.get("property") == MONTHLY_PRICE_FIELD for sort in sorts
+    )
+    if not uses_price:
+        return payload
+    if not price_property:
+        raise ValueError(
+            f"This query needs Notion to evaluate it, but Notion has no \"{MONTHLY_PRICE_FIELD}\" property. "
+            "Rephrase it without the price condition, or set NOTION_PRICE_NUMBER_PROPERTY to the database's price Number property."
+        )
+    remote = dict(payload)
+    if payload.get("filter"):
+        remote["filter"] = _rename_filter_property(payload["filter"], MONTHLY_PRICE_FIELD, price_property)
+    if sorts:
+        remote["sorts"] = [
+            {**sort, "property": price_property} if sort.get("property") == MONTHLY_PRICE_FIELD else sort for sort in sorts
+        ]
+    return remote
+
+
+class LocalQueryEngine:
+    """Evaluates Notion filter/sorts payloads over an in-memory list of records.
+
+    Equality and `contains` clauses on hash-indexed properties and range clauses on
+    date- or number-indexed properties narrow the candidate rows before the full predicate runs.
+    """
+
+    def __init__(self, records: list, hash_indexes=DEFAULT_HASH_INDEXES, date_indexes=DEFAULT_DATE_INDEXES,
+                 number_indexes=DEFAULT_NUMBER_INDEXES):
+        self.records = list(records)
+        self._hash = {name: {} for name in hash_indexes}
+        self._dates = {name: ([], []) for name in date_indexes}  # name -> (sorted keys, row positions)
+        self._numbers = {name: ([], []) for name in number_indexes}
+
+        for pos, record in enumerate(self.records):
+            for name, index in self._hash.items():
+                index.setdefault(record.get(name), []).append(pos)
+        for name, (keys, positions) in self._dates.items():
+            pairs = sorted((_date_part(r[name]), pos) for pos, r in enumerate(self.records) if r.get(name))
+            keys.extend(key for key, _ in pairs)
+            positions.extend(pos for _, pos in pairs)
+        for name, (keys, positions) in self._numbers.items():
+            pairs = sorted((r[name], pos) for pos, r in enumerate(self.records) if isinstance(r.get(name), (int, float)))
+            keys.extend(key for key, _ in pairs)
+            positions.extend(pos for _, pos in pairs)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _clause_candidates(self, clause: dict, today: date):
+        """Row positions a single property clause can match, or None if no index applies."""
+        name = clause.get("property")
+        prop_type = next((key for key in clause if key != "property"), None)
+        if name is None or not isinstance(clause.get(prop_type), dict) or len(clause[prop_type]) != 1:
+            return None
+        (op, arg), = clause[prop_type].items()
+
+        if name in self._hash:
+            index = self._hash[name]
+            if op == "equals":
+                return set(index.get(arg, ()))
+            if op == "contains" and prop_type in TEXT_TYPES:
+                needle = _text(arg).lower()
+                return {pos for value, rows in index.items() if needle in _text(value).lower() for pos in rows}
+        if name in self._dates and prop_type == "date" and (op in DATE_RANGE_OPS or op.startswith(("past_", "next_", "this_"))):
+            keys, positions = self._dates[name]
+            low, high = date_bounds(op, arg, today)
+            start = bisect.bisect_left(keys, low) if low else 0
+            end = bisect.bisect_right(keys, high) if high else len(keys)
+            return set(positions[start:end])
+        if name in self._numbers and prop_type == "number":
+            keys, positions = self._numbers[name]
+            bounds = {
+                "equals": (bisect.bisect_left(keys, arg), bisect.bisect_right(keys, arg)),
+                "greater_than": (bisect.bisect_right(keys, arg), len(keys)),
+                "greater_than_or_equal_to": (bisect.bisect_left(keys, arg), len(keys)),
+                "less_than": (0, bisect.bisect_left(keys, arg)),
+                "less_than_or_equal_to": (0, bisect.bisect_right(keys, arg)),
+            }
+            if op in bounds:
+                start, end = bounds[op]
+                return set(positions[start:end])
+        return None
+
+    def _candidates(self, filter_spec: dict, today: date):
+        if not filter_spec:
+            return None
+        if "and" in filter_spec:
+            sets = [self._candidates(f, today) for f in filter_spec["and"]]
+            sets = [s for s in sets if s is not None]
+            return set.intersection(*sets) if sets else None
+        if "or" in filter_spec:
+            sets = [self._candidates(f, today) for f in filter_spec["or"]]
+            return set.union(*sets) if sets and all(s is not None for s in sets) else None
+        return self._clause_candidates(filter_spec, today)
+
+    def query(self, payload: dict, today: date = None) -> list:
+        """Returns the records matching `payload["filter"]`, ordered by `payload["sorts"]`."""
+        today = today or date.today()
+        filter_spec = payload.get("filter")
+        predicate = compile_filter(filter_spec, today)
+        candidates = self._candidates(filter_spec, today)
+        rows = self.records if candidates is None else [self.records[pos] for pos in sorted(candidates)]
+        return sort_records([r for r in rows if predicate(r)], payload.get("sorts"))
@@ -0,0 +1,239 @@
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from price_parser import MONTHLY_PRICE_FIELD, parse_price_eur
+
+# Bump when the shape of mirrored records changes so existing mirrors are rebuilt
+MIRROR_SCHEMA_VERSION = "2"
+
+
+def _first_text(items) -> str:
+    return items[0]["text"]["content"] if items else None
+
+
+# How to read a plain value out of each Notion property type
+PROPERTY_GETTERS = {
+    "title": lambda prop: _first_text(prop.get("title")),
+    "rich_text": lambda prop: _first_text(prop.get("rich_text")),
+    "select": lambda prop: (prop.get("select") or {}).get("name"),
+    "status": lambda prop: (prop.get("status") or {}).get("name"),
+    "date": lambda prop: (prop.get("date") or {}).get("start"),
+    "url": lambda prop: prop.get("url") or None,
+    "number": lambda prop: prop.get("number"),
+}
+
+
+def flatten_properties(props: dict) -> dict:
+    """Flattens Notion page properties into a plain {name: value} record."""
+    record = {}
+    for name, prop_data in props.items():
+        getter = PROPERTY_GETTERS.get(prop_data.get("type"))
+        if getter:
+            value = getter(prop_data)
+            if value is not None:
+                record[name] = value
+    return record
+
+
+class RowExtractor:
+    """Reads page properties into compact tuples, with the getters resolved once per schema."""
+
+    def __init__(self, schema: tuple):
+        self.schema = schema
+        self.columns = tuple(name for name, prop_type in schema if prop_type in PROPERTY_GETTERS)
+        self._getters = tuple(PROPERTY_GETTERS[prop_type] for _, prop_type in schema if prop_type in PROPERTY_GETTERS)
+
+    def __call__(self, props: dict) -> tuple:
+        return tuple(getter(props.get(name) or {}) for name, getter in zip(self.columns, self._getters))
+
+
+@functools.lru_cache(maxsize=16)
+def row_extractor(schema: tuple) -> RowExtractor:
+    """The extractor for a ((name, type), ...) schema, built once and reused."""
+    return RowExtractor(schema)
+
+
+def page_schema(page: dict) -> tuple:
+    return tuple((name, prop.get("type")) for name, prop in page.get("properties", {}).items())
+
+
+def iter_database_pages(client, database_id: str, page_size: int = 100, **payload):
+    """Yields every page matching a query, following start_cursor/has_more pagination."""
+    cursor = None
+    while True:
+        kwargs = dict(payload, database_id=database_id, page_size=page_size)
+        if cursor:
+            kwargs["start_cursor"] = cursor
+        response = client.databases.query(**kwargs)
+        yield from response["results"]
+        if not response.get("has_more") or not response.get("next_cursor"):
+            return
+        cursor = response["next_cursor"]
+
+
+def iter_query_rows(client, database_id: str, page_size: int = 100, **payload):
+    """Streams a query as (columns, rows) batches of tuples, fetching one API page at a time."""
+    extractor, columns, batch = None, None, []
+    for page in iter_database_pages(client, database_id, page_size, **payload):
+        props = page.get("properties", {})
+        if extractor is None or len(props) != len(extractor.schema) or any(name not in props for name in extractor.columns):
+            if batch:
+                yield columns, batch
+                batch = []
+            extractor = row_extractor(page_schema(page))
+            columns = extractor.columns
+        batch.append(extractor(props))
+        if len(batch) >= page_size:
+            yield columns, batch
+            batch = []
+    if batch:
+        yield columns, batch
+
+
+def iter_record_rows(records: list, batch_size: int = 100):
+    """The same (columns, rows) batches for already-flattened records, e.g. local query results."""
+    columns = tuple(dict.fromkeys(name for record in records for name in record))
+    for start in range(0, len(records), batch_size):
+        yield columns, [tuple(record.get(name) for name in columns) for record in records[start:start + batch_size]]
+
+
+class NotionMirror:
+    """Local SQLite copy of the tracker database, kept fresh by incremental sync.
+
+    `sync()` pulls only pages edited since the last sync (by `last_edited_time`);
+    a full sync every `full_sync_seconds` also drops pages deleted in Notion.
+    Writes made through the app are applied with `upsert_page()` straight away.
+    """
+
+    def __init__(self, path: str, client, database_id: str, full_sync_seconds: float = 6 * 3600):
+        self.client = client
+        self.database_id = database_id
+        self.full_sync_seconds = full_sync_seconds
+        self._lock = threading.RLock()
+        self._last_sync_check = 0.0
+        self.version = 0  # Bumped on every local change so readers can rebuild derived indexes
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS pages (
+                id TEXT PRIMARY KEY,
+                title TEXT,
+                last_edited_time TEXT NOT NULL,
+                record TEXT NOT NULL
+            );
+            DROP INDEX IF EXISTS idx_pages_title;  -- Name lookups go through name_index.NameIndex
+            CREATE TABLE IF NOT EXISTS sync_state (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        if self._state("schema_version") != MIRROR_SCHEMA_VERSION:
+            # Force the next sync to be a full one so every record gets the new fields
+            self._set_state("last_full_sync", "0")
+            self._set_state("schema_version", MIRROR_SCHEMA_VERSION)
+        self._conn.commit()
+
+    # --- sync ---
+
+    def _state(self, key: str) -> str:
+        row = self._conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, key: str, value: str) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", (key, value))
+
+    def _write_page(self, page: dict) -> bool:
+        """Applies one page to the mirror; returns False when the stored copy was already identical."""
+        if page.get("archived") or page.get("in_trash"):
+            return self._conn.execute("DELETE FROM pages WHERE id = ?", (page["id"],)).rowcount > 0
+        record = flatten_properties(page.get("properties", {}))
+        if MONTHLY_PRICE_FIELD not in record:
+            monthly_price = parse_price_eur(record.get("Price"))
+            if monthly_price is not None:
+                record[MONTHLY_PRICE_FIELD] = monthly_price
+        row = (page.get("last_edited_time", ""), json.dumps(record))
+        if self._conn.execute("SELECT last_edited_time, record FROM pages WHERE id = ?", (page["id"],)).fetchone() == row:
+            return False
+        self._conn.execute(
+            "INSERT OR REPLACE INTO pages (id, title, last_edited_time, record) VALUES (?, ?, ?, ?)",
+            (page["id"], record.get("Property Name")) + row,
+        )
+        return True
+
+    def _pages_since(self, cursor_time: str):
+        payload = {"sorts": [{"timestamp": "last_edited_time", "direction": "ascending"}]}
+        if cursor_time:
+            # Notion timestamps are minute-granular, so re-reading the boundary minute is expected
+            payload["filter"] = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": cursor_time}}
+        return iter_database_pages(self.client, self.database_id, **payload)
+
+    def sync(self, full: bool = False) -> int:
+        """Pulls pages edited since the last sync (or everything) and returns how many changed."""
+        with self._lock:
+            last_full = float(self._state("last_full_sync") or 0)
+            full = full or time.time() - last_full > self.full_sync_seconds
+            cursor_time = None if full else self._state("last_edited_cursor")
+
+            seen, newest, changed = set(), cursor_time or "", 0
+            for page in self._pages_since(cursor_time):
+                changed += self._write_page(page)
+                seen.add(page["id"])
+                newest = max(newest, page.get("last_edited_time", ""))
+
+            if full:
+                # Anything we didn't see in a full walk was deleted or archived in Notion
+                known = {row[0] for row in self._conn.execute("SELECT id FROM pages")}
+                for stale_id in known - seen:
+                    self._conn.execute("DELETE FROM pages WHERE id = ?", (stale_id,))
+                    changed += 1
+                self._set_state("last_full_sync", str(time.time()))
+            if newest:
+                self._set_state("last_edited_cursor", newest)
+            self._conn.commit()
+            if changed:
+                self.version += 1
+            self._last_sync_check = time.time()
+            return changed
+
+    def sync_if_stale(self, max_age_seconds: float = 60) -> None:
+        """Runs an incremental sync at most once every `max_age_seconds`."""
+        if time.time() - self._last_sync_check > max_age_seconds:
+            self.sync()
+
+    # --- writes ---
+
+    def upsert_page(self, page: dict) -> None:
+        """Applies a page returned by pages.create / pages.update to the mirror."""
+        with self._lock:
+            if self._write_page(page):
+                self._conn.commit()
+                self.version += 1
+
+    # --- reads ---
+
+    def items(self) -> list:
+        """(page_id, record) pairs for every mirrored page, most recently edited first."""
+        with self._lock:
+            rows = self._conn.execute("SELECT id, record FROM pages ORDER BY last_edited_time DESC").fetchall()
+        return [(page_id, json.loads(record)) for page_id, record in rows]
+
+    def snapshot_items(self) -> list:
+        """(page_id, last_edited_time, record) for every mirrored page, for analytics exports."""
+        with self._lock:
+            rows = self._conn.execute("SELECT id, last_edited_time, record FROM pages ORDER BY last_edited_time DESC").fetchall()
+        return [(page_id, last_edited, json.loads(record)) for page_id, last_edited, record in rows]
+
+    def records(self) -> list:
+        """Every mirrored record, most recently edited first."""
+        return [record for _, record in self.items()]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
@@ -0,0 +1,70 @@
+import re
+
+# Numeric monthly rent derived from the free-text "Price" property
+MONTHLY_PRICE_FIELD = "Monthly Price"
+
+# Thousands may be grouped with commas or spaces ("€1,772", "€ 1 772")
+PRICE_NUMBER_RE = re.compile(r"(\d{1,3}(?:,\d{3})+|\d{1,3}(?:[ \u00a0\u202f]\d{3})+(?![\d,])|\d+(?:\.\d+)?)\s*(k\b)?", re.IGNORECASE)
+CURRENCY_BEFORE_RE = re.compile(r"€\s*$")
+CURRENCY_AFTER_RE = re.compile(r"\s*(?:€|eur(?:os?)?\b)", re.IGNORECASE)
+# What may sit between the two ends of a range: "€1,500 - €1,800", "1500 to 1800 EUR"
+PRICE_RANGE_RE = re.compile(r"\s*(?:-|–|—|to)\s*€?\s*", re.IGNORECASE)
+# Multipliers that turn a per-period price into a monthly one
+PRICE_PERIODS = [
+    (re.compile(r"per\s+(?:month|calendar\s+month)|/\s*(?:mo|month)\b|\bmonthly\b|\bpcm\b|\bp/?m\b", re.IGNORECASE), 1),
+    (re.compile(r"per\s+week|/\s*(?:wk|week)|\bweekly\b|\bp/?w\b", re.IGNORECASE), 52 / 12),
+    (re.compile(r"per\s+(?:annum|year)|/\s*(?:yr|year)|\byearly\b|\bannually\b|\bp/?a\b", re.IGNORECASE), 1 / 12),
+    (re.compile(r"per\s+day|/\s*day|\bdaily\b", re.IGNORECASE), 365 / 12),
+]
+# Anything smaller can't be a rent - it's a bedroom count or similar
+MIN_PLAUSIBLE_PRICE = 50
+
+
+def _match_amount(match) -> float:
+    amount = float(re.sub(r"[,\s]", "", match.group(1)))
+    return amount * 1000 if match.group(2) else amount
+
+
+def parse_amount(text: str) -> float:
+    """Parses "1,772", "1772.50" or "1.8k" into a float."""
+    match = PRICE_NUMBER_RE.fullmatch(text.strip())
+    if not match:
+        raise ValueError(f"Not a price amount: {text!r}")
+    return _match_amount(match)
+
+
+def _period_multiplier(text: str) -> float:
+    for pattern, multiplier in PRICE_PERIODS:
+        if pattern.search(text):
+            return multiplier
+    return None
+
+
+def parse_price_eur(text: str) -> float:
+    """Monthly EUR rent from free text such as "€1,772 per month" or "€450 per week".
+
+    Amounts written with € or EUR win over bare numbers ("Apartment 145, €1,500"), and
+    a range ("€1,500 - €1,800") uses its lower bound. Returns None if no price is found.
+    """
+    if not text:
+        return None
+    text = str(text)
+    matches = list(PRICE_NUMBER_RE.finditer(text))
+    anchored = [
+        i for i, match in enumerate(matches)
+        if CURRENCY_BEFORE_RE.search(text[:match.start()]) or CURRENCY_AFTER_RE.match(text, match.end())
+    ]
+    candidates = anchored or [i for i, match in enumerate(matches) if _match_amount(match) >= MIN_PLAUSIBLE_PRICE]
+    if not candidates:
+        return None
+
+    first = last = candidates[0]
+    amount = _match_amount(matches[first])
+    if first + 1 < len(matches) and PRICE_RANGE_RE.fullmatch(text, matches[first].end(), matches[first + 1].start()):
+        last = first + 1
+        amount = min(amount, _match_amount(matches[last]))
+
+    # The period that follows this amount, before the next one: "€1,650 per month (€380 per week)"
+    following = text[matches[last].end():matches[last + 1].start() if last + 1 < len(matches) else len(text)]
+    multiplier = _period_multiplier(following) or _period_multiplier(text) or 1
+    return round(amount * multiplier, 2)
@@ -0,0 +1,75 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class ScrapeCache:
+    """On-disk cache of scraped listings keyed by daft.ie listing ID.
+
+    Entries expire after `ttl_seconds`; once more than `max_entries` are stored
+    the least recently used ones are evicted.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 7 * 24 * 3600, max_entries: int = 1000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS scrape_cache (
+                listing_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_scrape_cache_last_used ON scrape_cache (last_used)")
+        self._conn.commit()
+
+    def get(self, listing_id: str) -> dict:
+        """Returns the cached listing, or None if it is missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, stored_at FROM scrape_cache WHERE listing_id = ?", (listing_id,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM scrape_cache WHERE listing_id = ?", (listing_id,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE scrape_cache SET last_used = ? WHERE listing_id = ?", (now, listing_id))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, listing_id: str, data: dict) -> None:
+        """Stores a listing and evicts the least recently used entries over the limit."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO scrape_cache (listing_id, data, stored_at, last_used) VALUES (?, ?, ?, ?)",
+                (listing_id, json.dumps(data), now, now),
+            )
+            self._conn.execute(
+                """DELETE FROM scrape_cache WHERE listing_id IN (
+                       SELECT listing_id FROM scrape_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                   )""",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM scrape_cache").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
@@ -0,0 +1,267 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from daft_parser import NEXT_DATA_PATTERN, http_session, listing_id_from_url
+
+DAFT_BASE_URL = "https://www.daft.ie"
+LISTING_HREF_PATTERN = re.compile(r'href="(/for-rent/[^"?#]+/\d+)"')
+
+
+def with_query(url: str, **params) -> str:
+    """`url` with the given query parameters set (existing ones kept unless overridden)."""
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query.update({key: str(value) for key, value in params.items()})
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def parse_search_results(html: str) -> tuple:
+    """Listings on one daft.ie results page and the `from` offset of the next page (or None).
+
+    Each listing is a dict with id, url and price. Reads __NEXT_DATA__ and falls back
+    to the listing links in the markup.
+    """
+    listings, next_from = [], None
+    match = NEXT_DATA_PATTERN.search(html)
+    if match:
+        try:
+            page_props = json.loads(match.group(1)).get("props", {}).get("pageProps", {})
+        except json.JSONDecodeError:
+            page_props = {}
+        for item in page_props.get("listings") or []:
+            listing = item.get("listing") or item
+            path = listing.get("seoFriendlyPath")
+            listing_id = str(listing.get("id") or listing_id_from_url(path) or "")
+            if listing_id and path:
+                listings.append({"id": listing_id, "url": urljoin(DAFT_BASE_URL, path), "price": listing.get("price")})
+        paging = page_props.get("paging") or {}
+        if paging.get("currentPage") and paging.get("totalPages") and paging["currentPage"] < paging["totalPages"]:
+            next_from = paging.get("nextFrom")
+
+    if not listings:
+        seen = set()
+        for path in LISTING_HREF_PATTERN.findall(html):
+            listing_id = listing_id_from_url(path)
+            if listing_id and listing_id not in seen:
+                seen.add(listing_id)
+                listings.append({"id": listing_id, "url": urljoin(DAFT_BASE_URL, path), "price": None})
+    return listings, next_from
+
+
+class SearchWatcher:
+    """Polls saved daft.ie search URLs and reports listings it hasn't seen before.
+
+    Seen listing IDs (with the price last seen) and each page's ETag/Last-Modified are
+    kept in SQLite, so a poll is a conditional GET of the first results page and only
+    walks further pages while every listing on the page is new. `on_listing(search_url,
+    listing, changed)` is called for each new listing, and for known ones whose price moved.
+    """
+
+    def __init__(self, path: str, on_listing=None, max_pages: int = 3, session=None, timeout: float = 10):
+        self.on_listing = on_listing
+        self.max_pages = max_pages
+        self.session = session or http_session
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = None
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS searches (
+                url TEXT PRIMARY KEY,
+                label TEXT,
+                baseline_pending INTEGER NOT NULL DEFAULT 0,
+                last_polled REAL,
+                last_found INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT
+            );
+            CREATE TABLE IF NOT EXISTS page_validators (
+                url TEXT PRIMARY KEY,
+                search_url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT
+            );
+            CREATE TABLE IF NOT EXISTS seen_listings (
+                search_url TEXT NOT NULL,
+                listing_id TEXT NOT NULL,
+                price TEXT,
+                first_seen REAL NOT NULL,
+                PRIMARY KEY (search_url, listing_id)
+            );
+        """)
+        self._conn.commit()
+
+    # --- saved searches ---
+
+    def add_search(self, url: str, label: str = None, import_existing: bool = False) -> None:
+        """Saves a search. Unless `import_existing`, listings already on it are only marked as seen."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO searches (url, label, baseline_pending) VALUES (?, ?, ?)",
+                (url, label, 0 if import_existing else 1),
+            )
+            self._conn.commit()
+
+    def remove_search(self, url: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM searches WHERE url = ?", (url,))
+            self._conn.execute("DELETE FROM seen_listings WHERE search_url = ?", (url,))
+            self._conn.execute("DELETE FROM page_validators WHERE search_url = ?", (url,))
+            self._conn.commit()
+
+    def searches(self) -> list:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT s.*, (SELECT COUNT(*) FROM seen_listings WHERE search_url = s.url) AS seen "
+                "FROM searches s ORDER BY s.url"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    # --- polling ---
+
+    def _fetch(self, url: str) -> tuple:
+        """(page HTML, (etag, last_modified)), or (None, None) if unchanged since it was last stored (HTTP 304)."""
+        with self._lock:
+            row = self._conn.execute("SELECT etag, last_modified FROM page_validators WHERE url = ?", (url,)).fetchone()
+        headers = {}
+        if row and row["etag"]:
+            headers["If-None-Match"] = row["etag"]
+        if row and row["last_modified"]:
+            headers["If-Modified-Since"] = row["last_modified"]
+
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            return None, None
+        response.raise_for_status()
+        return response.text, (response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+    def _store_validators(self, search_url: str, pages: list) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO page_validators (url, search_url, etag, last_modified) VALUES (?, ?, ?, ?)",
+                [(url, search_url, etag, last_modified) for url, (etag, last_modified) in pages],
+            )
+            self._conn.commit()
+
+    def _unseen(self, search_url: str, listings: list) -> list:
+        """(listing, changed) for listings not seen on this search before, or whose price moved."""
+        fresh = []
+        with self._lock:
+            for listing in listings:
+                row = self._conn.execute(
+                    "SELECT price FROM seen_listings WHERE search_url = ? AND listing_id = ?", (search_url, listing["id"])
+                ).fetchone()
+                price = str(listing["price"]) if listing.get("price") is not None else None
+                if row is None:
+                    fresh.append((listing, False))
+                elif price is not None and row["price"] != price:
+                    fresh.append((listing, True))
+        return fresh
+
+    def _mark_seen(self, search_url: str, listings: list) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO seen_listings (search_url, listing_id, price, first_seen) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (search_url, listing_id) DO UPDATE SET price = COALESCE(excluded.price, price)",
+                [
+                    (search_url, listing["id"], str(listing["price"]) if listing.get("price") is not None else None, now)
+                    for listing in listings
+                ],
+            )
+            self._conn.commit()
+
+    def poll(self, search_url: str) -> list:
+        """Checks one saved search; returns the (listing, changed) pairs it reported.
+
+        A listing only counts as seen once `on_listing` has accepted it, so one that
+        fails to hand off is reported again on the next poll. Likewise a page's ETag is
+        only kept once all of its listings are handed off, so it can't answer 304 first.
+        """
+        with self._lock:
+            search = self._conn.execute("SELECT * FROM searches WHERE url = ?", (search_url,)).fetchone()
+        if search is None:
+            raise ValueError(f"Not a saved search: {search_url}")
+
+        found, pages, errors = {}, [], []  # pages: (url, validators, ids of the listings it reported)
+        try:
+            # Newest first, so older pages only need fetching while everything is new
+            page_url = search_url if "sort=" in search_url else with_query(search_url, sort="publishDateDesc")
+            for _ in range(self.max_pages):
+                html, validators = self._fetch(page_url)
+                if html is None:
+                    break
+                listings, next_from = parse_search_results(html)
+                fresh = [(listing, changed) for listing, changed in self._unseen(search_url, listings) if listing["id"] not in found]
+                found.update((listing["id"], (listing, changed)) for listing, changed in fresh)
+                pages.append((page_url, validators, {listing["id"] for listing, _ in fresh}))
+                if search["baseline_pending"]:
+                    self._mark_seen(search_url, listings)  # First poll of a search just learns what's already there
+                if next_from is None or not listings or sum(1 for _, changed in fresh if not changed) < len(listings):
+                    break
+                page_url = with_query(page_url, **{"from": next_from})
+        except Exception as e:
+            errors.append(str(e))
+
+        reported, failed = [], set()
+        if search["baseline_pending"]:
+            if not errors:
+                self._store_validators(search_url, [(url, validators) for url, validators, _ in pages])
+        else:
+            for listing, changed in found.values():
+                try:
+                    if self.on_listing:
+                        self.on_listing(search_url, listing, changed)
+                except Exception as e:
+                    errors.append(f"{listing['url']}: {e}")
+                    failed.add(listing["id"])
+                    continue
+                self._mark_seen(search_url, [listing])
+                reported.append((listing, changed))
+            self._store_validators(search_url, [(url, validators) for url, validators, ids in pages if not ids & failed])
+        error = "; ".join(errors) or None
+        with self._lock:
+            self._conn.execute(
+                "UPDATE searches SET baseline_pending = ?, last_polled = ?, last_found = ?, last_error = ? WHERE url = ?",
+                (1 if search["baseline_pending"] and errors else 0, time.time(), len(reported), error, search_url),
+            )
+            self._conn.commit()
+        return reported
+
+    def poll_all(self) -> int:
+        """Polls every saved search; returns how many listings were reported."""
+        return sum(len(self.poll(search["url"])) for search in self.searches())
+
+    # --- schedule ---
+
+    def start(self, interval_seconds: float) -> None:
+        """Polls every saved search on a background thread every `interval_seconds` (idempotent)."""
+        if self._thread:
+            return
+
+        def run():
+            while not self._stopping.is_set():
+                try:
+                    self.poll_all()
+                except Exception:
+                    pass  # Errors are recorded per search; keep the schedule alive
+                self._stopping.wait(interval_seconds)
+
+        self._thread = threading.Thread(target=run, name="search-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        self._thread = None
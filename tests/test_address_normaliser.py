@@ -0,0 +1,87 @@
+import json
+import os
+import random
+import re
+
+import pytest
+
+from address_normaliser import LOCATION_PREFIXES, PROPERTY_PREFIXES, normalise_address, normalise_many
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "daft_addresses.json")
+
+
+def load_golden() -> list:
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def legacy_normalise(full_address: str) -> dict:
+    """The per-pattern cleaning the scraper used before address_normaliser, kept as the reference."""
+    address_parts = [part.strip() for part in full_address.split(',')]
+    property_name = address_parts[0].strip()
+    for pattern in PROPERTY_PREFIXES:
+        property_name = re.sub('^' + pattern, '', property_name, flags=re.IGNORECASE).strip()
+    if not re.match(r'^\d+\s+[A-Za-z]', property_name):
+        name_parts = [part.strip() for part in property_name.split(',') if part.strip()]
+        if name_parts:
+            property_name = name_parts[0]
+    if not re.match(r'^\d+\s+[A-Za-z]', property_name):
+        property_name = re.sub(r'^[^\w\s]+', '', property_name).strip()
+        if not re.match(r'^\d+\s+[A-Za-z]', property_name):
+            property_name = re.sub(r'^\d+\s*(?![A-Za-z])', '', property_name).strip()
+    property_name = re.sub(r'\s*,\s*', ' ', property_name)
+    property_name = ' '.join(property_name.split())
+    if not property_name or len(property_name) < 2:
+        if len(address_parts) > 1:
+            property_name = address_parts[1].strip()
+            for pattern in PROPERTY_PREFIXES:
+                property_name = re.sub('^' + pattern, '', property_name, flags=re.IGNORECASE).strip()
+        else:
+            property_name = "Unknown Property"
+
+    clean_address = full_address
+    for pattern in LOCATION_PREFIXES:
+        clean_address = re.sub('^' + pattern, '', clean_address, flags=re.IGNORECASE).strip()
+    clean_address = re.sub(r'^[^\w\s]+', '', clean_address).strip()
+    clean_address = re.sub(r'^,\s*', '', clean_address).strip()
+    clean_address = re.sub(r'\s*,\s*', ', ', clean_address)
+    clean_address = ' '.join(clean_address.split())
+
+    normalised = {"property_name": property_name or "Unknown Property", "location": clean_address or full_address}
+    match = re.search(r"Dublin\s+(\d{1,2})", full_address, re.IGNORECASE)
+    if match:
+        normalised["dublin_zone"] = f"D{match.group(1)}"
+    return normalised
+
+
+@pytest.mark.parametrize("case", load_golden(), ids=lambda case: case["address"][:40])
+def test_golden_addresses(case):
+    expected = {key: value for key, value in case.items() if key != "address"}
+    assert normalise_address(case["address"]) == expected
+
+
+def test_golden_corpus_matches_legacy_cleaning():
+    for case in load_golden():
+        assert legacy_normalise(case["address"]) == {key: value for key, value in case.items() if key != "address"}
+
+
+def test_normalise_many_matches_single_calls():
+    addresses = [case["address"] for case in load_golden()] * 2
+    assert normalise_many(addresses) == [normalise_address(address) for address in addresses]
+
+
+def test_matches_legacy_cleaning_on_generated_addresses():
+    pieces = [
+        "Apartment", "Apartment 12", "Flat", "Flat 3", "Studio", "Studio 4", "Unit 7", "House", "2 Bedroom",
+        "1 Bedroom Apartment", "3 Bedroom Flat", "2 Bed", "4 Bedroom House", "Apartment 2 Bedroom",
+        "House 3 Bedroom", "Studio Apartment", "39 Synge Street", "12A", "5", "-", "--", "#", "The Hendrick",
+        "Spencer House", "Mayor Street Lower", "IFSC", "Dublin 1", "Dublin 24", "Co. Dublin", "", " ",
+    ]
+    separators = [", ", ",", " ", " , ", "  "]
+    rng = random.Random(10)
+    for _ in range(5000):
+        parts = rng.choices(pieces, k=rng.randint(1, 5))
+        address = "".join(part + rng.choice(separators) for part in parts).strip(rng.choice(["", " ", ","]))
+        if rng.random() < 0.2:
+            address = address.lower() if rng.random() < 0.5 else address.upper()
+        assert normalise_address(address) == legacy_normalise(address), address
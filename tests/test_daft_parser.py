@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from daft_parser import build_listing_record, extract_listing_fields, parse_listing_dom, parse_next_data
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bench_fixtures")
+LISTING_URL = "https://www.daft.ie/for-rent/apartment-17-spencer-house-custom-house-square-ifsc-dublin-1/6230870"
+EXPECTED_FIELDS = {
+    "price": "€2,450 per month",
+    "address": "Apartment 17, Spencer House, Custom House Square, Mayor Street Lower, IFSC, Dublin 1",
+    "beds": "2 Bed",
+    "contact": "Hooke & MacDonald",
+}
+
+
+def read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture
+def listing_html():
+    return read_fixture("listing.html")
+
+
+@pytest.fixture
+def dom_only_html():
+    return read_fixture("listing_dom_only.html")
+
+
+def test_next_data_path(listing_html):
+    assert parse_next_data(listing_html) == EXPECTED_FIELDS
+    assert extract_listing_fields(listing_html) == EXPECTED_FIELDS
+
+
+def test_dom_path(dom_only_html):
+    assert parse_next_data(dom_only_html) == {}
+    assert parse_listing_dom(dom_only_html) == EXPECTED_FIELDS
+    assert extract_listing_fields(dom_only_html) == EXPECTED_FIELDS
+
+
+def test_dom_fills_fields_missing_from_next_data(listing_html):
+    html = listing_html.replace('"seller"', '"sellerRemoved"')
+    assert "contact" not in parse_next_data(html)
+    assert extract_listing_fields(html) == EXPECTED_FIELDS
+
+
+def test_no_listing_markup():
+    assert extract_listing_fields("<html><body><p>Gone</p></body></html>") == {}
+
+
+def test_build_listing_record(listing_html):
+    record = build_listing_record(LISTING_URL, extract_listing_fields(listing_html))
+    assert record["price"] == "€2,450"
+    assert record["price_eur"] == 2450.0
+    assert record["property_name"] == "Spencer House"
+    assert record["dublin_zone"] == "D1"
+    assert record["housing_type"] == "2 Bedroom"
+    assert record["contact_info"] == "Hooke & MacDonald"
+
+
+def test_build_listing_record_housing_type_from_url():
+    record = build_listing_record("https://www.daft.ie/for-rent/studio-apartment-dublin-8/123", {"beds": "2 Bed"})
+    assert record["housing_type"] == "Studio"
+
+
+def test_build_listing_record_missing_fields():
+    record = build_listing_record("https://www.daft.ie/for-rent/somewhere/123", {})
+    assert record == {
+        "price": "Price not found",
+        "property_name": "Unknown Property",
+        "location": "Location not found",
+        "contact_info": "Contact info not found",
+    }
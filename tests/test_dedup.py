@@ -0,0 +1,58 @@
+from dedup import DedupIndex
+
+SPENCER_17 = (
+    "https://www.daft.ie/for-rent/apartment-17-spencer-house-custom-house-square-ifsc-dublin-1/6230870",
+    "Spencer House",
+    "Apartment 17, Spencer House, Custom House Square, Mayor Street Lower, IFSC, Dublin 1",
+)
+SPENCER_21 = (
+    "https://www.daft.ie/for-rent/apartment-21-spencer-house-custom-house-square-ifsc-dublin-1/6230999",
+    "Apartment 21, Spencer House",
+    "Apartment 21, Spencer House, Custom House Square, Mayor Street Lower, IFSC, Dublin 1",
+)
+HENDRICK_1_BED = ("https://www.daft.ie/for-rent/1-bedroom-apartment-the-hendrick-smithfield-dublin-7/5987932", "The Hendrick", "Smithfield, Dublin 7")
+HENDRICK_2_BED = ("https://www.daft.ie/for-rent/2-bedroom-apartment-the-hendrick-smithfield-dublin-7/5987940", "The Hendrick", "Smithfield, Dublin 7")
+
+
+def test_same_listing_matches_by_id_and_url():
+    index = DedupIndex()
+    index.add("page-17", *SPENCER_17)
+    assert index.find(SPENCER_17[0] + "?utm_source=share", "Anything", "Else") == ("page-17", "listing ID")
+    assert index.find("https://www.daft.ie/for-rent/spencer-house/6230870") == ("page-17", "listing ID")
+
+
+def test_units_in_the_same_building_are_not_duplicates():
+    index = DedupIndex()
+    index.add("page-17", *SPENCER_17)
+    index.add("page-1-bed", *HENDRICK_1_BED)
+    assert index.find(*SPENCER_21) is None
+    assert index.find(*HENDRICK_2_BED) is None
+
+
+def test_name_match_still_applies_when_one_side_has_no_link():
+    index = DedupIndex()
+    index.add("page-17", *SPENCER_17)
+    index.add("manual", None, "Griffith Wood", "Griffith Avenue, Drumcondra, Dublin 9")
+    assert index.find(None, "Spencer House", SPENCER_17[2]) == ("page-17", "name and location")
+    match = index.find("https://www.daft.ie/for-rent/griffith-wood-griffith-avenue-drumcondra-dublin-9/6100001",
+                       "Griffith Wood", "Griffith Ave, Drumcondra, Dublin 9")
+    assert match is not None and match[0] == "manual"
+
+
+def test_shared_fingerprint_finds_the_compatible_entry():
+    index = DedupIndex()
+    index.add("page-1-bed", *HENDRICK_1_BED)
+    index.add("page-2-bed", *HENDRICK_2_BED)
+    assert index.find(None, "The Hendrick", "Smithfield, Dublin 7")[1] == "name and location"
+    index.remove("page-1-bed")
+    assert index.find(None, "The Hendrick", "Smithfield, Dublin 7") == ("page-2-bed", "name and location")
+    assert index.find(*HENDRICK_1_BED) is None
+
+
+def test_dedupe_batch_keeps_separate_units():
+    index = DedupIndex()
+    records = [
+        {"website_link": url, "property_name": name, "location": location}
+        for url, name, location in (HENDRICK_1_BED, HENDRICK_2_BED, HENDRICK_1_BED, SPENCER_17, SPENCER_21)
+    ]
+    assert index.dedupe(records) == [None, None, (0, "listing ID"), None, None]
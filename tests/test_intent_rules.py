@@ -0,0 +1,43 @@
+import pytest
+
+from intent_rules import STATUS_OPTIONS, STATUS_PHRASES, classify_intent_fast
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Spencer House rejected my application", {"intent": "update", "property_name": "Spencer House", "status": "Rejected"}),
+    ("The agent at Spencer House accepted me", {"intent": "update", "property_name": "Spencer House", "status": "Accepted"}),
+    ("mark The Hendrick as waitlisted", {"intent": "update", "property_name": "The Hendrick", "status": "Waitlisted"}),
+    ("I applied to The Hendrick", {"intent": "create", "property_name": "The Hendrick", "status": "Applied"}),
+    ("I applied for a 2 bed at Spencer House", {"intent": "create", "property_name": "Spencer House", "status": "Applied", "housing_type": "2 Bedroom"}),
+    ("mark Spencer House as interview/tour", {"intent": "update", "property_name": "Spencer House", "status": "Interview/Tour"}),
+])
+def test_formulaic_inputs(text, expected):
+    assert classify_intent_fast(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "I applied for it yesterday",
+    "I applied to this place",
+    "The landlord accepted me",
+    "The agent rejected me",
+    "They rejected my application",
+    "mark it as rejected",
+    "I got rejected by the agent",
+])
+def test_pronouns_and_generic_subjects_go_to_llm(text):
+    assert classify_intent_fast(text) is None
+
+
+@pytest.mark.parametrize("text", [
+    "I applied to Sunset Apartments for 2200",
+    "I applied to Oak House for 1800 a month",
+    "I applied to the Hendrick on Monday",
+    "I applied to Oak House near Ranelagh",
+    "I applied to Spencer House at 5pm",
+])
+def test_create_with_leftover_details_goes_to_llm(text):
+    assert classify_intent_fast(text) is None
+
+
+def test_every_status_option_has_phrases():
+    assert list(STATUS_PHRASES) == STATUS_OPTIONS
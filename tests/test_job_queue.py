@@ -0,0 +1,73 @@
+import threading
+import time
+
+from job_queue import DONE, FAILED, QUEUED, JobQueue
+
+
+def wait_for(queue, job_id, status, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job["status"] == status:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} never reached {status}: {queue.get(job_id)}")
+
+
+def test_queued_job_is_not_queued_twice(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), handlers={"scrape": lambda payload: payload})
+    first = queue.submit("scrape", {"url": "a"}, key="listing:1")
+    second = queue.submit("scrape", {"url": "a"}, key="listing:1")
+    assert first == second
+    assert queue.counts() == {QUEUED: 1}
+
+
+def test_done_job_runs_again_with_new_payload(tmp_path):
+    runs = []
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), handlers={"scrape": lambda payload: runs.append(payload) or payload},
+                     poll_seconds=0.01)
+    queue.start()
+    try:
+        job_id = queue.submit("scrape", {"url": "a", "force_refresh": False}, key="listing:1")
+        wait_for(queue, job_id, DONE)
+
+        assert queue.submit("scrape", {"url": "a", "force_refresh": True}, key="listing:1") == job_id
+        job = wait_for(queue, job_id, DONE)
+    finally:
+        queue.stop()
+    assert runs == [{"url": "a", "force_refresh": False}, {"url": "a", "force_refresh": True}]
+    assert job["result"] == {"url": "a", "force_refresh": True}
+
+
+def test_running_job_is_not_queued_twice(tmp_path):
+    release = threading.Event()
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), handlers={"scrape": lambda payload: release.wait(5)},
+                     poll_seconds=0.01)
+    queue.start()
+    try:
+        job_id = queue.submit("scrape", {"url": "a"}, key="listing:1")
+        wait_for(queue, job_id, "running")
+        assert queue.submit("scrape", {"url": "a", "force_refresh": True}, key="listing:1") == job_id
+        assert queue.get(job_id)["payload"] == {"url": "a"}
+        release.set()
+        wait_for(queue, job_id, DONE)
+    finally:
+        queue.stop()
+
+
+def test_failed_job_is_retried_then_requeued(tmp_path):
+    def fail(payload):
+        raise ValueError("boom")
+
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), handlers={"scrape": fail}, max_attempts=2,
+                     backoff_seconds=0.01, poll_seconds=0.01)
+    queue.start()
+    try:
+        job_id = queue.submit("scrape", {"url": "a"}, key="listing:1")
+        job = wait_for(queue, job_id, FAILED)
+        assert job["attempts"] == 2 and "boom" in job["error"]
+    finally:
+        queue.stop()
+    assert queue.submit("scrape", {"url": "b"}, key="listing:1") == job_id
+    job = queue.get(job_id)
+    assert (job["status"], job["attempts"], job["payload"]) == (QUEUED, 0, {"url": "b"})
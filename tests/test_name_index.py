@@ -0,0 +1,38 @@
+import pytest
+
+from name_index import AmbiguousPropertyError, NameIndex
+
+ITEMS = [
+    ("page-maple", {"Property Name": "Maple Gardens", "Location": "Rathmines Road, Rathmines, Dublin 6"}),
+    ("page-spencer-17", {"Property Name": "Apartment 17, Spencer House", "Location": "Custom House Square, IFSC, Dublin 1"}),
+    ("page-spencer-21", {"Property Name": "Apartment 21, Spencer House", "Location": "Custom House Square, IFSC, Dublin 1"}),
+    ("page-hendrick", {"Property Name": "The Hendrick", "Location": "Smithfield, Dublin 7"}),
+]
+
+
+@pytest.fixture
+def index():
+    return NameIndex(ITEMS)
+
+
+def test_exact_name(index):
+    assert index.resolve("The Hendrick")["page_id"] == "page-hendrick"
+    assert index.resolve("maple gardens")["page_id"] == "page-maple"
+
+
+def test_misspelt_name(index):
+    assert index.resolve("Maple Gardnes")["page_id"] == "page-maple"
+
+
+def test_ambiguous_name(index):
+    with pytest.raises(AmbiguousPropertyError) as excinfo:
+        index.resolve("Spencer")
+    assert {candidate["page_id"] for candidate in excinfo.value.candidates} == {"page-spencer-17", "page-spencer-21"}
+    assert index.resolve("Spencer House 21")["page_id"] == "page-spencer-21"
+
+
+def test_no_match(index):
+    with pytest.raises(ValueError, match="No entry found") as excinfo:
+        index.resolve("Griffith Wood")
+    assert not isinstance(excinfo.value, AmbiguousPropertyError)
+    assert index.search("") == []
@@ -0,0 +1,100 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("notion_client")
+import httpx
+from notion_client.errors import HTTPResponseError
+
+from notion_async import AsyncNotionWriter
+
+RETRY_AFTER_SECONDS = 0.3
+
+
+def http_error(status: int, headers: dict = None) -> HTTPResponseError:
+    # Built by hand: the constructor's signature differs between notion-client releases
+    error = HTTPResponseError.__new__(HTTPResponseError)
+    Exception.__init__(error, f"HTTP {status}")
+    error.status = status
+    error.code = str(status)
+    error.headers = httpx.Headers(headers or {})
+    error.body = ""
+    return error
+
+
+class FakePages:
+    """pages.create that fails as scripted per page name, then succeeds."""
+
+    def __init__(self, failures: dict):
+        self.failures = failures  # name -> errors to raise on successive calls
+        self.calls = []           # (name, monotonic time)
+
+    async def create(self, parent, properties):
+        name = properties["Name"]
+        self.calls.append((name, time.monotonic()))
+        pending = self.failures.get(name)
+        if pending:
+            raise pending.pop(0)
+        # Later inputs finish first, so result order can't just follow completion order
+        await asyncio.sleep(0.01 * (5 - int(name[-1])))
+        return {"id": name}
+
+
+class FakeClient:
+    def __init__(self, failures: dict):
+        self.pages = FakePages(failures)
+
+
+def create_pages(client, names, **writer_options):
+    finished = []
+
+    async def main():
+        writer = AsyncNotionWriter(client, "db", rate=100, backoff_seconds=0.01, **writer_options)
+        results = await writer.create_pages([{"Name": name} for name in names], on_result=lambda i, r: finished.append(i))
+        return writer, results
+
+    started = time.monotonic()
+    writer, results = asyncio.run(main())
+    return writer, results, finished, started
+
+
+def test_retries_429_then_5xx_and_keeps_input_order():
+    client = FakeClient({
+        "page0": [http_error(429, {"Retry-After": str(RETRY_AFTER_SECONDS)}), http_error(502)],
+        "page1": [http_error(503)],
+    })
+    writer, results, finished, _ = create_pages(client, [f"page{i}" for i in range(5)])
+
+    assert results == [{"id": f"page{i}"} for i in range(5)]
+    assert sorted(finished) == list(range(5)) and finished != list(range(5))
+    assert writer.retries == 3
+    assert [name for name, _ in client.pages.calls].count("page0") == 3
+    assert [name for name, _ in client.pages.calls].count("page1") == 2
+
+
+def test_429_pauses_the_whole_bucket():
+    client = FakeClient({
+        "page0": [http_error(429, {"Retry-After": str(RETRY_AFTER_SECONDS)})],
+        "page1": [http_error(500)],
+    })
+    _, results, _, started = create_pages(client, ["page0", "page1"])
+
+    assert results == [{"id": "page0"}, {"id": "page1"}]
+    retried = [at - started for name, at in client.pages.calls[2:]]
+    # The 500's short backoff still waits out the 429's Retry-After
+    assert len(retried) == 2 and min(retried) >= RETRY_AFTER_SECONDS * 0.9
+
+
+def test_non_retryable_and_exhausted_errors_are_returned_in_place():
+    client = FakeClient({
+        "page1": [http_error(400)],
+        "page2": [http_error(502) for _ in range(3)],
+    })
+    writer, results, _, _ = create_pages(client, ["page0", "page1", "page2"], max_retries=2)
+
+    assert results[0] == {"id": "page0"}
+    assert isinstance(results[1], HTTPResponseError) and results[1].status == 400
+    assert isinstance(results[2], HTTPResponseError) and results[2].status == 502
+    assert [name for name, _ in client.pages.calls].count("page1") == 1
+    assert [name for name, _ in client.pages.calls].count("page2") == 3
@@ -0,0 +1,48 @@
+import pytest
+
+from notion_filter import LocalQueryEngine, remote_payload
+
+PRICE_QUERY = {
+    "filter": {"and": [
+        {"property": "Dublin Zone", "rich_text": {"equals": "D8"}},
+        {"or": [{"property": "Monthly Price", "number": {"less_than_or_equal_to": 1800}}]},
+    ]},
+    "sorts": [{"property": "Monthly Price", "direction": "ascending"}, {"property": "Application Date", "direction": "descending"}],
+}
+
+
+def test_local_engine_filters_and_sorts_on_monthly_price():
+    records = [
+        {"Property Name": "A", "Dublin Zone": "D8", "Monthly Price": 1750},
+        {"Property Name": "B", "Dublin Zone": "D8", "Monthly Price": 1600},
+        {"Property Name": "C", "Dublin Zone": "D8", "Monthly Price": 2100},
+        {"Property Name": "D", "Dublin Zone": "D2", "Monthly Price": 1500},
+    ]
+    names = [r["Property Name"] for r in LocalQueryEngine(records).query(PRICE_QUERY)]
+    assert names == ["B", "A"]
+
+
+def test_remote_payload_without_price_is_unchanged():
+    payload = {"filter": {"property": "Status", "status": {"equals": "Applied"}}, "sorts": []}
+    assert remote_payload(payload) is payload
+
+
+def test_remote_payload_maps_price_to_notion_property():
+    remote = remote_payload(PRICE_QUERY, "Rent (EUR)")
+    assert remote["filter"]["and"][1]["or"][0] == {"property": "Rent (EUR)", "number": {"less_than_or_equal_to": 1800}}
+    assert remote["filter"]["and"][0] == PRICE_QUERY["filter"]["and"][0]
+    assert [sort["property"] for sort in remote["sorts"]] == ["Rent (EUR)", "Application Date"]
+    assert PRICE_QUERY["sorts"][0]["property"] == "Monthly Price"  # Original left alone
+
+
+def test_remote_payload_keeps_a_real_monthly_price_property():
+    assert remote_payload(PRICE_QUERY, "Monthly Price") is PRICE_QUERY
+
+
+@pytest.mark.parametrize("payload", [
+    PRICE_QUERY,
+    {"sorts": [{"property": "Monthly Price", "direction": "descending"}]},
+])
+def test_remote_payload_without_price_property_explains(payload):
+    with pytest.raises(ValueError, match="NOTION_PRICE_NUMBER_PROPERTY"):
+        remote_payload(payload, "")
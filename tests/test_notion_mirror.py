@@ -0,0 +1,117 @@
+import pytest
+
+from bench import FakeNotionClient, synthetic_records, to_notion_page
+from notion_mirror import NotionMirror
+
+DATABASE_ID = "test-database"
+
+
+class FilteringNotionClient(FakeNotionClient):
+    """FakeNotionClient that also honours the mirror's last_edited_time filter and logs each query."""
+
+    class _Databases(FakeNotionClient._Databases):
+        def __init__(self, pages):
+            super().__init__(pages)
+            self.queries = []
+
+        def query(self, database_id: str, page_size: int = 100, start_cursor: str = None, **payload):
+            self.queries.append(dict(payload, start_cursor=start_cursor))
+            since = payload.get("filter", {}).get("last_edited_time", {}).get("on_or_after")
+            if since is None:
+                return super().query(database_id, page_size, start_cursor)
+            pages, self._pages = self._pages, [page for page in self._pages if page["last_edited_time"] >= since]
+            try:
+                return super().query(database_id, page_size, start_cursor)
+            finally:
+                self._pages = pages
+
+
+def make_pages(count: int) -> list:
+    return [to_notion_page(i, record) for i, record in enumerate(synthetic_records(count))]
+
+
+@pytest.fixture
+def pages():
+    return make_pages(250)
+
+
+@pytest.fixture
+def client(pages):
+    return FilteringNotionClient(pages)
+
+
+@pytest.fixture
+def mirror(tmp_path, client):
+    return NotionMirror(str(tmp_path / "mirror.sqlite3"), client, DATABASE_ID)
+
+
+def test_full_sync_follows_pagination(mirror, client, pages):
+    assert mirror.sync(full=True) == 250
+    assert mirror.count() == 250
+    assert [query["start_cursor"] for query in client.databases.queries] == [None, "100", "200"]
+    assert {page_id for page_id, _ in mirror.items()} == {page["id"] for page in pages}
+
+
+def test_records_carry_derived_monthly_price(mirror, pages):
+    mirror.sync(full=True)
+    record = dict(mirror.items())[pages[0]["id"]]
+    assert record["Monthly Price"] == float(record["Price"].split()[0].lstrip("€").replace(",", ""))
+
+
+def test_incremental_sync_only_asks_for_pages_since_the_cursor(mirror, client, pages):
+    mirror.sync(full=True)
+    newest = max(page["last_edited_time"] for page in pages)
+
+    pages[5]["last_edited_time"] = "2099-01-01T00:00:00.000Z"
+    pages[5]["properties"]["Status"]["status"]["name"] = "Accepted"
+    mirror.sync()
+
+    assert client.databases.queries[-1]["filter"]["last_edited_time"] == {"on_or_after": newest}
+    assert dict(mirror.items())[pages[5]["id"]]["Status"] == "Accepted"
+    mirror.sync()
+    assert client.databases.queries[-1]["filter"]["last_edited_time"] == {"on_or_after": "2099-01-01T00:00:00.000Z"}
+
+
+def test_rereading_unchanged_pages_keeps_the_version(mirror, pages):
+    mirror.sync(full=True)
+    version = mirror.version
+
+    assert mirror.sync() == 0  # Re-reads the boundary minute, which hasn't changed
+    assert mirror.sync(full=True) == 0
+    mirror.upsert_page(pages[0])
+    assert mirror.version == version
+
+    pages[0]["properties"]["Status"]["status"]["name"] = "Waitlisted"
+    pages[0]["last_edited_time"] = "2099-01-01T00:00:00.000Z"
+    assert mirror.sync() == 1
+    assert mirror.version == version + 1
+
+
+def test_full_sync_drops_deleted_and_archived_pages(mirror, client, pages):
+    mirror.sync(full=True)
+    deleted = pages.pop(0)
+    archived = pages[0]
+    archived["archived"] = True
+
+    version = mirror.version
+    assert mirror.sync(full=True) >= 2
+    ids = {page_id for page_id, _ in mirror.items()}
+    assert deleted["id"] not in ids and archived["id"] not in ids
+    assert mirror.count() == 248
+    assert mirror.version > version
+
+
+def test_upsert_page_writes_through(mirror, pages):
+    mirror.sync(full=True)
+    version = mirror.version
+
+    page = dict(pages[3], last_edited_time="2099-01-01T00:00:00.000Z")
+    page["properties"] = dict(page["properties"], Status={"id": "b", "type": "status", "status": {"name": "Rejected"}})
+    mirror.upsert_page(page)
+    assert mirror.version == version + 1
+    page_id, record = mirror.items()[0]
+    assert (page_id, record["Status"]) == (page["id"], "Rejected")
+
+    mirror.upsert_page(dict(page, archived=True))
+    assert page["id"] not in {page_id for page_id, _ in mirror.items()}
+    assert mirror.count() == 249
@@ -0,0 +1,34 @@
+import pytest
+
+from price_parser import parse_amount, parse_price_eur
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("€1,772 per month", 1772),
+    ("€1,772", 1772),
+    ("€ 1 772", 1772),
+    ("1,772 EUR monthly", 1772),
+    ("€450 per week", 1950),
+    ("€20,000 per annum", 1666.67),
+    ("€1.8k pcm", 1800),
+    ("€1,500 - €1,800 per month", 1500),
+    ("1500 to 1800", 1500),
+    ("€1,500 - €1,800 per week", 6500),
+    ("Apartment 145, €1500", 1500),
+    ("2 bed, 1772 pcm", 1772),
+    ("€1,650 per month (€380 per week)", 1650),
+    ("Weekly rent: €450", 1950),
+])
+def test_parse_price_eur(text, expected):
+    assert parse_price_eur(text) == expected
+
+
+@pytest.mark.parametrize("text", [None, "", "Price on application", "2 bed, 1 bath"])
+def test_parse_price_eur_without_a_price(text):
+    assert parse_price_eur(text) is None
+
+
+def test_parse_amount():
+    assert [parse_amount(text) for text in ("1,772", "1772.50", "1.8k")] == [1772, 1772.5, 1800]
+    with pytest.raises(ValueError):
+        parse_amount("about 1800")
@@ -0,0 +1,133 @@
+import json
+import os
+
+import pytest
+
+from search_watcher import SearchWatcher, parse_search_results, with_query
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bench_fixtures")
+SEARCH_URL = "https://www.daft.ie/property-for-rent/dublin-city?rentalPrice_to=2000"
+FIRST_PAGE = with_query(SEARCH_URL, sort="publishDateDesc")
+
+
+def read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def results_page(listings, next_from=None) -> str:
+    """A results page carrying only __NEXT_DATA__, like daft.ie's server render."""
+    data = {"props": {"pageProps": {
+        "listings": [{"listing": {"id": int(i), "seoFriendlyPath": f"/for-rent/apartment-{i}-dublin-8/{i}", "price": price}}
+                     for i, price in listings],
+        "paging": {"currentPage": 1, "totalPages": 2 if next_from else 1, "nextFrom": next_from},
+    }}}
+    return f'<html><script id="__NEXT_DATA__" type="application/json">{json.dumps(data)}</script></html>'
+
+
+class FakeResponse:
+    def __init__(self, status_code, text="", etag=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = {"ETag": etag} if etag else {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeSession:
+    """Serves pages by URL and answers 304 when the If-None-Match ETag still matches."""
+
+    def __init__(self):
+        self.pages = {}  # url -> (html, etag)
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(url)
+        html, etag = self.pages[url]
+        if etag and (headers or {}).get("If-None-Match") == etag:
+            return FakeResponse(304)
+        return FakeResponse(200, html, etag)
+
+
+@pytest.fixture
+def session():
+    return FakeSession()
+
+
+def make_watcher(tmp_path, session, on_listing):
+    return SearchWatcher(str(tmp_path / "watcher.sqlite3"), on_listing=on_listing, session=session)
+
+
+def test_parse_saved_search_page():
+    listings, next_from = parse_search_results(read_fixture("search_results.html"))
+    assert len(listings) == 20 and next_from == 20
+    assert listings[0] == {
+        "id": "6100000",
+        "url": "https://www.daft.ie/for-rent/apartment-3-spencer-house-ifsc-dublin-1/6100000",
+        "price": "€1,650 per month",
+    }
+    assert len({listing["id"] for listing in listings}) == 20
+
+
+def test_parse_falls_back_to_listing_links():
+    html = '<a href="/for-rent/apartment-1-dublin-8/111">A</a><a href="/for-rent/apartment-1-dublin-8/111">A</a>'
+    assert parse_search_results(html) == ([{"id": "111", "url": "https://www.daft.ie/for-rent/apartment-1-dublin-8/111", "price": None}], None)
+
+
+def test_baseline_then_new_and_repriced_listings(tmp_path, session):
+    reported = []
+    watcher = make_watcher(tmp_path, session, lambda search, listing, changed: reported.append((listing["id"], changed)))
+    watcher.add_search(SEARCH_URL)
+
+    session.pages[FIRST_PAGE] = (read_fixture("search_results.html"), "v1")
+    session.pages[with_query(FIRST_PAGE, **{"from": 20})] = (results_page([(6200000, "€2,000 per month")]), "v1")
+    assert watcher.poll(SEARCH_URL) == [] and reported == []
+    assert watcher.searches()[0]["seen"] == 21
+    assert watcher.searches()[0]["baseline_pending"] == 0
+
+    assert watcher.poll(SEARCH_URL) == []  # Unchanged: answered with 304
+    assert len(session.requests) == 3
+
+    session.pages[FIRST_PAGE] = (results_page([(7000001, "€1,800 per month"), (6100000, "€1,600 per month")]), "v2")
+    watcher.poll(SEARCH_URL)
+    assert reported == [("7000001", False), ("6100000", True)]
+
+
+def test_pages_on_only_while_everything_is_new(tmp_path, session):
+    watcher = make_watcher(tmp_path, session, lambda *args: None)
+    watcher.add_search(SEARCH_URL, import_existing=True)
+    second_page = with_query(FIRST_PAGE, **{"from": 20})
+    session.pages[FIRST_PAGE] = (results_page([(1, "€1,500"), (2, "€1,600")], next_from=20), "a")
+    session.pages[second_page] = (results_page([(3, "€1,700")]), "b")
+
+    assert [listing["id"] for listing, _ in watcher.poll(SEARCH_URL)] == ["1", "2", "3"]
+
+    session.pages[FIRST_PAGE] = (results_page([(4, "€1,400"), (1, "€1,500")], next_from=20), "c")
+    assert [listing["id"] for listing, _ in watcher.poll(SEARCH_URL)] == ["4"]
+    assert session.requests.count(second_page) == 1
+
+
+def test_listing_that_fails_to_hand_off_is_reported_again(tmp_path, session):
+    failing = {"2"}
+    handed_off = []
+
+    def on_listing(search, listing, changed):
+        if listing["id"] in failing:
+            raise RuntimeError("queue unavailable")
+        handed_off.append(listing["id"])
+
+    watcher = make_watcher(tmp_path, session, on_listing)
+    watcher.add_search(SEARCH_URL, import_existing=True)
+    session.pages[FIRST_PAGE] = (results_page([(1, "€1,500"), (2, "€1,600")]), "etag-1")
+
+    assert [listing["id"] for listing, _ in watcher.poll(SEARCH_URL)] == ["1"]
+    assert "queue unavailable" in watcher.searches()[0]["last_error"]
+
+    failing.clear()
+    assert [listing["id"] for listing, _ in watcher.poll(SEARCH_URL)] == ["2"]
+    assert handed_off == ["1", "2"]
+    assert watcher.searches()[0]["last_error"] is None
+    assert watcher.poll(SEARCH_URL) == []  # Handed off in full, so now answered with 304
+    assert handed_off == ["1", "2"]
@@ -0,0 +1,30 @@
+import pytest
+
+from tracing import Tracer, percentile
+
+
+@pytest.mark.parametrize("values, fraction, expected", [
+    ([1, 2], 0.5, 1),
+    ([1, 2, 3, 4, 5, 6], 0.5, 3),
+    ([1, 2, 3, 4, 5], 0.5, 3),
+    (list(range(1, 21)), 0.95, 19),
+    (list(range(1, 101)), 0.95, 95),
+    ([7], 0.95, 7),
+    ([1, 2, 3], 0.0, 1),
+    ([1, 2, 3], 1.0, 3),
+    ([], 0.5, None),
+])
+def test_nearest_rank_percentile(values, fraction, expected):
+    assert percentile(values, fraction) == expected
+
+
+def test_nested_spans_share_a_trace():
+    tracer = Tracer()
+    with tracer.span("outer"):
+        with tracer.span("inner"):
+            pass
+    inner, outer = tracer.spans()
+    assert (inner["name"], outer["name"]) == ("inner", "outer")
+    assert inner["trace_id"] == outer["trace_id"]
+    assert inner["parent"] == "outer" and outer["parent"] is None
+    assert sorted(row["Stage"] for row in tracer.stage_stats()) == ["inner", "outer"]
@@ -0,0 +1,104 @@
+import contextvars
+import math
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+
+# The span currently open in this thread/task, so nested spans share a trace ID
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class Tracer:
+    """Lightweight span timer that keeps the most recent spans in a ring buffer.
+
+    Spans nest: a span opened inside another belongs to the same trace, and the
+    outermost span of a trace is treated as the request when reporting slow ones.
+    """
+
+    def __init__(self, capacity: int = 5000, slow_seconds: float = 2.0):
+        self.slow_seconds = slow_seconds
+        self._spans = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        parent = _current_span.get()
+        record = {
+            "trace_id": parent["trace_id"] if parent else uuid.uuid4().hex[:12],
+            "name": name,
+            "parent": parent["name"] if parent else None,
+            "started_at": time.time(),
+            "seconds": None,
+            "error": None,
+            "attributes": attributes,
+        }
+        token = _current_span.set(record)
+        started = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record["error"] = type(e).__name__
+            raise
+        finally:
+            record["seconds"] = time.perf_counter() - started
+            _current_span.reset(token)
+            with self._lock:
+                self._spans.append(record)
+
+    def spans(self) -> list:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+    def stage_stats(self) -> list:
+        """Count, p50, p95 and max duration (ms) and error count for each span name."""
+        by_name = {}
+        for span in self.spans():
+            by_name.setdefault(span["name"], []).append(span)
+        stats = []
+        for name, spans in by_name.items():
+            durations = sorted(span["seconds"] for span in spans)
+            stats.append({
+                "Stage": name,
+                "Calls": len(spans),
+                "p50 (ms)": round(percentile(durations, 0.50) * 1000, 1),
+                "p95 (ms)": round(percentile(durations, 0.95) * 1000, 1),
+                "Max (ms)": round(durations[-1] * 1000, 1),
+                "Errors": sum(1 for span in spans if span["error"]),
+            })
+        stats.sort(key=lambda row: -row["p95 (ms)"])
+        return stats
+
+    def slow_traces(self, limit: int = 10) -> list:
+        """Most recent top-level spans slower than `slow_seconds`, with their slowest stages."""
+        spans = self.spans()
+        children = {}
+        for span in spans:
+            if span["parent"] is not None:
+                children.setdefault(span["trace_id"], []).append(span)
+        slow = [span for span in spans if span["parent"] is None and span["seconds"] >= self.slow_seconds]
+        slow.sort(key=lambda span: -span["started_at"])
+        traces = []
+        for root in slow[:limit]:
+            stages = sorted(children.get(root["trace_id"], []), key=lambda span: -span["seconds"])
+            traces.append({
+                "When": time.strftime("%H:%M:%S", time.localtime(root["started_at"])),
+                "Request": root["name"],
+                "Total (ms)": round(root["seconds"] * 1000),
+                "Slowest stages": ", ".join(f"{span['name']} {span['seconds'] * 1000:.0f} ms" for span in stages[:3]),
+                "Error": root["error"],
+            })
+        return traces